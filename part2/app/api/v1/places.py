@@ -1,5 +1,7 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import facade
+from app.persistence.search_index import tokenize
 
 # Create a namespace for places - groups all place-related endpoints
 api = Namespace('places', description='Place operations')
@@ -32,8 +34,8 @@ place_output_model = api.model('PlaceOutput', {
     'latitude': fields.Float(description='Latitude'),
     'longitude': fields.Float(description='Longitude'),
     'owner_id': fields.String(description='Owner (User) ID'),
-    'reviews': fields.List(fields.String, description='List of review IDs'),
-    'amenities': fields.List(fields.String, description='List of amenity IDs'),
+    'reviews': fields.List(fields.String(attribute='id'), description='List of review IDs'),
+    'amenities': fields.List(fields.String(attribute='id'), description='List of amenity IDs'),
     'created_at': fields.String(description='Creation timestamp'),
     'updated_at': fields.String(description='Last update timestamp')
 })
@@ -87,6 +89,39 @@ class PlaceList(Resource):
         return new_place, 201
 
 
+@api.route('/search')
+class PlaceSearch(Resource):
+    """
+    Resource for full-text search over place titles and descriptions.
+    """
+
+    @api.doc('search_places', params={
+        'q': 'Words that must all appear in the title or description',
+        'limit': 'Maximum number of places to return (1-100, default 20)',
+        'offset': 'Number of ranked places to skip (default 0)'
+    })
+    @api.marshal_list_with(place_output_model)
+    def get(self):
+        """
+        Search places, best match first.
+
+        The total number of matches is returned in the X-Total-Count header.
+
+        Returns:
+            List of matching places or 400 error for an invalid query
+        """
+        query = request.args.get('q', '')
+        limit = request.args.get('limit', 20, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        if not tokenize(query):
+            api.abort(400, 'Query parameter q must contain at least one word')
+        if not 1 <= limit <= 100 or offset < 0:
+            api.abort(400, 'limit must be between 1 and 100 and offset must not be negative')
+
+        places, total = facade.search_places_by_text(query, limit, offset)
+        return places, 200, {'X-Total-Count': str(total)}
+
+
 @api.route('/<string:place_id>')
 class PlaceDetail(Resource):
     """
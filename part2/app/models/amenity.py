@@ -1,6 +1,9 @@
 from app.models.base_model import BaseModel
 
 class Amenity(BaseModel):
+    __slots__ = ('name',)
+    updatable_fields = ('name',)
+
     def __init__(self, name):
         super().__init__()
         if not name:
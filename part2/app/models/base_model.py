@@ -1,20 +1,48 @@
+import sys
 import uuid
 from datetime import datetime
 
 class BaseModel:
-    """Base class for all models in the HBnB project."""
+    """
+    Base class for all models in the HBnB project.
+
+    Models use __slots__ instead of a per-instance __dict__ because millions
+    of them are kept in memory; every subclass must declare its own slots.
+    """
+    __slots__ = ('id', 'created_at', 'updated_at')
+
+    # String attributes whose values repeat a lot across instances
+    # (e.g., first names); they are interned so equal values share memory.
+    interned_fields = ()
+
+    # Attributes that update() may set; relationships, IDs and timestamps
+    # are changed through their own operations
+    updatable_fields = ()
+
     def __init__(self):
         self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        # datetime is immutable, so both timestamps can share one instance
+        now = datetime.now()
+        self.created_at = now
+        self.updated_at = now
 
     def save(self):
         """Update the updated_at timestamp whenever the object is modified."""
         self.updated_at = datetime.now()
 
     def update(self, data):
-        """Update the attributes of the object based on a dictionary."""
+        """
+        Update the attributes of the object based on a dictionary.
+
+        Raises:
+            ValueError: If data has a key outside updatable_fields; nothing
+                is changed in that case
+        """
+        unknown = [key for key in data if key not in self.updatable_fields]
+        if unknown:
+            raise ValueError(f"Cannot update {', '.join(sorted(unknown))} of {type(self).__name__}")
         for key, value in data.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+            if key in self.interned_fields and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
         self.save()
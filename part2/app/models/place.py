@@ -1,6 +1,10 @@
 from app.models.base_model import BaseModel
 
 class Place(BaseModel):
+    __slots__ = ('title', 'description', 'price', 'latitude', 'longitude', 'owner',
+                 '_amenities', '_reviews')
+    updatable_fields = ('title', 'description', 'price', 'latitude', 'longitude')
+
     def __init__(self, title, description, price, latitude, longitude, owner):
         super().__init__()
         
@@ -20,8 +24,36 @@ class Place(BaseModel):
         self.latitude = latitude
         self.longitude = longitude
         self.owner = owner  # This should be a User object
-        self.amenities = []  # List of Amenity objects
-        self.reviews = []    # List of Review objects
+        # Relationship lists are only allocated once something is added
+        self._amenities = None  # List of Amenity objects
+        self._reviews = None    # List of Review objects
+
+    @property
+    def amenities(self):
+        """Amenities of this place (the list is created on first use)."""
+        if self._amenities is None:
+            self._amenities = []
+        return self._amenities
+
+    @amenities.setter
+    def amenities(self, value):
+        self._amenities = value
+
+    @property
+    def reviews(self):
+        """Reviews of this place (the list is created on first use)."""
+        if self._reviews is None:
+            self._reviews = []
+        return self._reviews
+
+    @reviews.setter
+    def reviews(self, value):
+        self._reviews = value
+
+    @property
+    def owner_id(self):
+        """ID of the owner, so places can be indexed and serialized by owner."""
+        return self.owner.id if self.owner else None
 
     def add_amenity(self, amenity):
         """Associate an amenity with this place."""
@@ -31,3 +63,8 @@ class Place(BaseModel):
     def add_review(self, review):
         """Add a review to this place."""
         self.reviews.append(review)
+
+    def remove_review(self, review):
+        """Remove a review from this place, if present."""
+        if self._reviews and review in self._reviews:
+            self._reviews.remove(review)
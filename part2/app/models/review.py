@@ -1,6 +1,9 @@
 from app.models.base_model import BaseModel
 
 class Review(BaseModel):
+    __slots__ = ('text', 'rating', 'place', 'user')
+    updatable_fields = ('text', 'rating')
+
     def __init__(self, text, rating, place, user):
         super().__init__()
         if not (1 <= rating <= 5):
@@ -10,3 +13,13 @@ class Review(BaseModel):
         self.rating = rating
         self.place = place  # This should be a Place object
         self.user = user    # This should be a User object
+
+    @property
+    def place_id(self):
+        """ID of the reviewed place, so reviews can be indexed by place."""
+        return self.place.id if self.place else None
+
+    @property
+    def user_id(self):
+        """ID of the author, so reviews can be indexed by user."""
+        return self.user.id if self.user else None
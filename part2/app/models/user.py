@@ -1,15 +1,59 @@
+import sys
+
 from app.models.base_model import BaseModel
 
 class User(BaseModel):
+    __slots__ = ('first_name', 'last_name', 'email', 'is_admin', '_places', '_reviews')
+
+    interned_fields = ('first_name', 'last_name')
+    updatable_fields = ('first_name', 'last_name', 'email', 'is_admin')
+
     def __init__(self, first_name, last_name, email, is_admin=False):
         super().__init__()
         # Basic validation
         if not email or "@" not in email:
             raise ValueError("Invalid email address")
         
-        self.first_name = first_name
-        self.last_name = last_name
+        self.first_name = sys.intern(first_name) if isinstance(first_name, str) else first_name
+        self.last_name = sys.intern(last_name) if isinstance(last_name, str) else last_name
         self.email = email
         self.is_admin = is_admin
-        self.places = []  # List of places owned by this user
-        self.reviews = [] # List of reviews written by this user
+        # Relationship lists are only allocated once something is added
+        self._places = None  # List of places owned by this user
+        self._reviews = None # List of reviews written by this user
+
+    @property
+    def places(self):
+        """Places owned by this user (the list is created on first use)."""
+        if self._places is None:
+            self._places = []
+        return self._places
+
+    @places.setter
+    def places(self, value):
+        self._places = value
+
+    @property
+    def reviews(self):
+        """Reviews written by this user (the list is created on first use)."""
+        if self._reviews is None:
+            self._reviews = []
+        return self._reviews
+
+    @reviews.setter
+    def reviews(self, value):
+        self._reviews = value
+
+    def add_place(self, place):
+        """Record a place owned by this user."""
+        if place not in self.places:
+            self.places.append(place)
+
+    def add_review(self, review):
+        """Record a review written by this user."""
+        self.reviews.append(review)
+
+    def remove_review(self, review):
+        """Forget a review written by this user, if present."""
+        if self._reviews and review in self._reviews:
+            self._reviews.remove(review)
@@ -1,3 +1,29 @@
+import os
+
 from app.persistence.repository import Repository
+from app.persistence.concurrent_repository import ConcurrentRepository
+from app.persistence.journal import JournaledRepository
+
+
+def create_repository():
+    """
+    Build the repository selected by the environment.
+
+    HBNB_JOURNAL_DIR: if set, persist data in this directory
+        (JournaledRepository, which serializes all writes itself).
+    HBNB_JOURNAL_FSYNC: set to '1' to fsync the journal after every write.
+    HBNB_REPOSITORY: set to 'concurrent' for the lock-striped repository
+        when serving from several threads; otherwise the plain Repository.
+    """
+    journal_dir = os.environ.get('HBNB_JOURNAL_DIR')
+    if journal_dir:
+        return JournaledRepository(
+            journal_dir,
+            fsync=os.environ.get('HBNB_JOURNAL_FSYNC') == '1'
+        )
+    if os.environ.get('HBNB_REPOSITORY') == 'concurrent':
+        return ConcurrentRepository()
+    return Repository()
+
 
-__all__ = ['Repository']
+__all__ = ['Repository', 'ConcurrentRepository', 'JournaledRepository', 'create_repository']
@@ -0,0 +1,192 @@
+"""
+Concurrent Repository
+A thread-safe variant of the in-memory Repository for multi-threaded serving.
+
+Each entity type gets its own read/write lock (a "stripe"), so requests
+working on different entity types never wait for each other.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from app.persistence.repository import Repository
+
+
+class ReadWriteLock:
+    """
+    A lock that allows many readers or a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers queue up
+    behind it, so a steady stream of reads cannot starve writes.
+    The lock is not reentrant.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class _Stripe:
+    """The lock and write sequence number of one entity type."""
+    __slots__ = ('lock', 'sequence')
+
+    def __init__(self):
+        self.lock = ReadWriteLock()
+        # Odd while a write is in progress, bumped twice per write
+        self.sequence = 0
+
+
+class ConcurrentRepository(Repository):
+    """
+    Thread-safe in-memory repository with one read/write lock per entity type.
+
+    Reads do not take the lock at all in the common case: they run
+    optimistically and check the stripe's sequence number afterwards
+    (a seqlock), so get_all() never blocks writers for the duration of a
+    copy. Only if a writer got in the way does a read retry, and
+    eventually fall back to the read lock.
+
+    Args:
+        optimistic_retries: Lock-free attempts before a read takes the lock
+    """
+
+    def __init__(self, optimistic_retries=3):
+        super().__init__()
+        self.optimistic_retries = optimistic_retries
+        self._stripes = {}
+        self._stripes_guard = threading.Lock()
+
+    def _stripe(self, entity_type):
+        """Return the stripe of an entity type, creating it on first use."""
+        stripe = self._stripes.get(entity_type)
+        if stripe is None:
+            with self._stripes_guard:
+                stripe = self._stripes.setdefault(entity_type, _Stripe())
+        return stripe
+
+    @contextmanager
+    def _writing(self, entity_type):
+        """Hold a stripe's write lock and mark the write in its sequence."""
+        stripe = self._stripe(entity_type)
+        with stripe.lock.write_locked():
+            stripe.sequence += 1
+            try:
+                yield
+            finally:
+                stripe.sequence += 1
+
+    # ==================== WRITE OPERATIONS ====================
+
+    def register_index(self, entity_type, attribute, unique=False):
+        """Register an index while holding the entity type's write lock."""
+        with self._writing(entity_type):
+            super().register_index(entity_type, attribute, unique)
+
+    def add(self, obj):
+        """Add an object while holding its entity type's write lock."""
+        with self._writing(obj.__class__.__name__):
+            super().add(obj)
+
+    def update(self, obj):
+        """Update an object while holding its entity type's write lock."""
+        with self._writing(obj.__class__.__name__):
+            super().update(obj)
+
+    def delete(self, obj_id, entity_type):
+        """Delete an object while holding its entity type's write lock."""
+        with self._writing(entity_type):
+            super().delete(obj_id, entity_type)
+
+    # ==================== READ OPERATIONS ====================
+
+    def _read(self, entity_type, read, *args):
+        """
+        Run a read function optimistically, falling back to the read lock.
+
+        The function runs without any lock; if the stripe's sequence number
+        shows that no write started or finished meanwhile, its result is
+        consistent and is returned as is.
+        """
+        stripe = self._stripe(entity_type)
+        for _ in range(self.optimistic_retries):
+            start = stripe.sequence
+            if start % 2:
+                continue
+            try:
+                result = read(*args)
+            except RuntimeError:
+                # A dict changed size mid-iteration (only possible without a GIL)
+                continue
+            if stripe.sequence == start:
+                return result
+
+        with stripe.lock.read_locked():
+            return read(*args)
+
+    def get(self, obj_id, entity_type):
+        """Retrieve an object by ID without blocking writers."""
+        return self._read(entity_type, super().get, obj_id, entity_type)
+
+    def get_all(self, entity_type):
+        """
+        Retrieve all objects of a type without blocking writers.
+
+        A snapshot cached by a reader that raced with a writer is tagged
+        with the version it was built for, which the writer has already
+        moved past, so it is never served afterwards.
+
+        Returns:
+            An immutable snapshot (tuple) of all objects of that type
+        """
+        return self._read(entity_type, super().get_all, entity_type)
+
+    def find_by_attribute(self, entity_type, attribute, value):
+        """Find an object by attribute without blocking writers."""
+        return self._read(entity_type, super().find_by_attribute, entity_type, attribute, value)
+
+    def find_all_by_attribute(self, entity_type, attribute, value):
+        """Find all objects by attribute without blocking writers."""
+        return self._read(entity_type, super().find_all_by_attribute, entity_type, attribute, value)
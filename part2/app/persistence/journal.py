@@ -0,0 +1,404 @@
+"""
+Journaled Repository
+An optional durable mode for the in-memory Repository.
+
+Every add/update/delete is appended to a compact binary journal, and a
+background thread periodically writes a snapshot of the whole store and
+starts a fresh journal. On startup the latest snapshot is loaded and only
+the journal written after it is replayed.
+
+Files in the data directory:
+- snapshot.bin           latest snapshot (generation N)
+- journal-<N>.log        writes made after snapshot N
+
+Both files are pickles of our own objects, so the data directory must
+only ever be writable by the application itself.
+"""
+
+import io
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+from app.persistence.repository import Repository
+
+# Journal record operations
+OP_ADD = 1
+OP_UPDATE = 2
+OP_DELETE = 3
+
+# Record header: operation, payload length, CRC32 of the payload
+RECORD_HEADER = struct.Struct('>BII')
+
+# Snapshot header: magic, generation, CRC32 of the payload
+SNAPSHOT_MAGIC = b'HBNBSNP1'
+SNAPSHOT_HEADER = struct.Struct('>8sQI')
+
+SNAPSHOT_FILE = 'snapshot.bin'
+JOURNAL_PREFIX = 'journal-'
+JOURNAL_SUFFIX = '.log'
+
+
+def get_state(obj):
+    """
+    Return the picklable state of a model object.
+
+    Works for both __dict__-based and __slots__-based objects.
+    """
+    getstate = getattr(obj, '__getstate__', None)
+    if getstate is not None:
+        return getstate()
+    return obj.__dict__
+
+
+def restore_state(obj, state):
+    """
+    Apply a state returned by get_state() to an object in place.
+
+    Updating in place (instead of swapping in a new object) keeps every
+    other object that references this one pointing at the fresh values.
+    """
+    setstate = getattr(obj, '__setstate__', None)
+    if setstate is not None:
+        setstate(state)
+        return
+
+    slot_state = None
+    if isinstance(state, tuple):
+        state, slot_state = state
+    if state:
+        obj.__dict__.update(state)
+    if slot_state:
+        for key, value in slot_state.items():
+            setattr(obj, key, value)
+
+
+class JournaledRepository(Repository):
+    """
+    Repository that survives restarts.
+
+    Writes go to memory first (so unique indexes can reject them) and are
+    then appended to the journal before the call returns. Reads are served
+    from memory exactly like the plain Repository.
+
+    Args:
+        data_dir: Directory holding the snapshot and journal files
+        fsync: If True, fsync the journal after every record (slow, safest);
+            otherwise records are flushed to the OS and survive a process
+            crash but not a power loss
+        snapshot_interval: Seconds between background snapshots
+            (None disables the timer)
+        snapshot_threshold: Number of journal records that triggers an
+            early background snapshot (None disables it)
+    """
+
+    def __init__(self, data_dir, fsync=False, snapshot_interval=300,
+                 snapshot_threshold=100000):
+        super().__init__()
+        self.data_dir = data_dir
+        self.fsync = fsync
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_threshold = snapshot_threshold
+
+        # Guards the in-memory store and the journal file together
+        self._lock = threading.RLock()
+        # Only one snapshot may be written at a time
+        self._snapshot_lock = threading.Lock()
+
+        self._generation = 0
+        self._journal = None
+        self._records_since_snapshot = 0
+
+        os.makedirs(data_dir, exist_ok=True)
+        self._recover()
+
+        # Background snapshots
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._snapshot_thread = None
+        if snapshot_interval is not None or snapshot_threshold is not None:
+            self._snapshot_thread = threading.Thread(
+                target=self._snapshot_loop,
+                name='hbnb-snapshot',
+                daemon=True
+            )
+            self._snapshot_thread.start()
+
+    # ==================== WRITE OPERATIONS ====================
+
+    def add(self, obj):
+        """Add an object and append it to the journal."""
+        with self._lock:
+            super().add(obj)
+            self._append(OP_ADD, self._encode_object(obj))
+
+    def update(self, obj):
+        """Update an object and append its new state to the journal."""
+        entity_type = obj.__class__.__name__
+        with self._lock:
+            if obj.id not in self.storage.get(entity_type, {}):
+                return
+            super().update(obj)
+            self._append(OP_UPDATE, self._encode_object(obj))
+
+    def delete(self, obj_id, entity_type):
+        """Delete an object and append the deletion to the journal."""
+        with self._lock:
+            if obj_id not in self.storage.get(entity_type, {}):
+                return
+            super().delete(obj_id, entity_type)
+            self._append(OP_DELETE, pickle.dumps((entity_type, obj_id), pickle.HIGHEST_PROTOCOL))
+
+    # ==================== SNAPSHOTS ====================
+
+    def snapshot(self):
+        """
+        Write a snapshot of the whole store and compact the journal.
+
+        The store is pickled while holding the write lock (objects are
+        mutated in place, so this is the only consistent point), but the
+        file I/O happens after writers have been released.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                data = self._encode_snapshot()
+                self._generation += 1
+                generation = self._generation
+                self._open_journal(generation)
+                self._records_since_snapshot = 0
+
+            self._write_snapshot(generation, data)
+            self._remove_journals_before(generation)
+
+    def close(self):
+        """Stop the background snapshot thread and close the journal."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _snapshot_loop(self):
+        """Take a snapshot every interval, or sooner when the journal grows."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.snapshot_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                return
+            if self._records_since_snapshot:
+                self.snapshot()
+
+    def _write_snapshot(self, generation, data):
+        """Atomically replace the snapshot file."""
+        path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, generation, zlib.crc32(data)))
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._fsync_dir()
+
+    def _fsync_dir(self):
+        """Make renames and file creations in the data directory durable."""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(self.data_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # ==================== JOURNAL ====================
+
+    def _journal_path(self, generation):
+        return os.path.join(self.data_dir, f'{JOURNAL_PREFIX}{generation:020d}{JOURNAL_SUFFIX}')
+
+    def _journal_generations(self):
+        """Generations of the journal files on disk, oldest first."""
+        generations = []
+        for name in os.listdir(self.data_dir):
+            if name.startswith(JOURNAL_PREFIX) and name.endswith(JOURNAL_SUFFIX):
+                number = name[len(JOURNAL_PREFIX):-len(JOURNAL_SUFFIX)]
+                if number.isdigit():
+                    generations.append(int(number))
+        return sorted(generations)
+
+    def _open_journal(self, generation):
+        """Switch appends to the journal file of a generation."""
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self._journal_path(generation), 'ab')
+        self._fsync_dir()
+
+    def _remove_journals_before(self, generation):
+        """Delete journals that are fully covered by a snapshot."""
+        for old in self._journal_generations():
+            if old < generation:
+                os.remove(self._journal_path(old))
+
+    def _append(self, op, payload):
+        """Append one record and flush it (and fsync it if configured)."""
+        self._journal.write(RECORD_HEADER.pack(op, len(payload), zlib.crc32(payload)))
+        self._journal.write(payload)
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+        self._records_since_snapshot += 1
+        if (self.snapshot_threshold is not None
+                and self._records_since_snapshot >= self.snapshot_threshold):
+            self._wakeup.set()
+
+    def _encode_object(self, obj):
+        """
+        Serialize one object for the journal.
+
+        References to other stored objects are written as (type, id) pairs
+        so the record only carries this object's own state.
+        """
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self._persistent_id
+        pickler.dump((obj.__class__, obj.id, get_state(obj)))
+        return buffer.getvalue()
+
+    def _encode_snapshot(self):
+        """
+        Serialize the whole store as flat lists of classes, IDs and states.
+
+        Pickling the storage dict directly would follow object references
+        (user -> places -> reviews -> user ...) recursively and overflow the
+        stack on large graphs, so references are written as positions in
+        these lists instead. Classes and IDs go in a first pickle so the
+        loader can allocate every object before reading the states.
+        """
+        objects = [obj for entities in self.storage.values() for obj in entities.values()]
+        positions = {id(obj): position for position, obj in enumerate(objects)}
+
+        buffer = io.BytesIO()
+        pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL).dump(
+            ([obj.__class__ for obj in objects], [obj.id for obj in objects])
+        )
+        pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda obj: positions.get(id(obj))
+        pickler.dump([get_state(obj) for obj in objects])
+        return buffer.getvalue()
+
+    def _decode_snapshot(self, data):
+        """Rebuild the storage dictionary from _encode_snapshot() output."""
+        stream = io.BytesIO(data)
+        classes, ids = pickle.Unpickler(stream).load()
+        objects = [cls.__new__(cls) for cls in classes]
+
+        unpickler = pickle.Unpickler(stream)
+        unpickler.persistent_load = objects.__getitem__
+        states = unpickler.load()
+
+        storage = {}
+        for obj, obj_id, state in zip(objects, ids, states):
+            restore_state(obj, state)
+            storage.setdefault(obj.__class__.__name__, {})[obj_id] = obj
+        return storage
+
+    def _decode_object(self, payload):
+        unpickler = pickle.Unpickler(io.BytesIO(payload))
+        unpickler.persistent_load = self._persistent_load
+        return unpickler.load()
+
+    def _persistent_id(self, obj):
+        obj_id = getattr(obj, 'id', None)
+        if obj_id is None or not isinstance(obj_id, str):
+            return None
+        entity_type = obj.__class__.__name__
+        if self.storage.get(entity_type, {}).get(obj_id) is obj:
+            return (entity_type, obj_id)
+        return None
+
+    def _persistent_load(self, pid):
+        entity_type, obj_id = pid
+        return self.storage.get(entity_type, {}).get(obj_id)
+
+    # ==================== RECOVERY ====================
+
+    def _recover(self):
+        """Load the latest snapshot, replay the journal tail and reopen it."""
+        generation = self._load_snapshot()
+
+        journals = [g for g in self._journal_generations() if g >= generation]
+        for journal_generation in journals:
+            self._replay(self._journal_path(journal_generation))
+
+        self._remove_journals_before(generation)
+        self._generation = journals[-1] if journals else generation
+        self._records_since_snapshot = 0
+        self.rebuild_indexes()
+        self._open_journal(self._generation)
+
+    def _load_snapshot(self):
+        """Load snapshot.bin if present and return its generation (0 if none)."""
+        path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return 0
+
+        with open(path, 'rb') as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            data = f.read()
+
+        if len(header) < SNAPSHOT_HEADER.size:
+            raise ValueError(f"Snapshot {path} is truncated")
+        magic, generation, checksum = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC or zlib.crc32(data) != checksum:
+            raise ValueError(f"Snapshot {path} is corrupt")
+
+        self.storage = self._decode_snapshot(data)
+        self.snapshots = {}
+        return generation
+
+    def _replay(self, path):
+        """
+        Apply every complete record of a journal file.
+
+        A torn record at the end (crash mid-write) is cut off so that new
+        records are appended after the last good one.
+        """
+        good_offset = 0
+        with open(path, 'rb') as f:
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+                op, length, checksum = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                self._apply(op, payload)
+                good_offset = f.tell()
+
+        if good_offset < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(good_offset)
+
+    def _apply(self, op, payload):
+        """Apply one journal record to memory without journaling it again."""
+        if op == OP_DELETE:
+            entity_type, obj_id = pickle.loads(payload)
+            Repository.delete(self, obj_id, entity_type)
+            return
+
+        cls, obj_id, state = self._decode_object(payload)
+        existing = self.storage.get(cls.__name__, {}).get(obj_id)
+        if existing is None:
+            obj = cls.__new__(cls)
+            restore_state(obj, state)
+            Repository.add(self, obj)
+        else:
+            restore_state(existing, state)
+            Repository.update(self, existing)
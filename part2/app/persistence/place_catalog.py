@@ -0,0 +1,112 @@
+"""
+Place Catalog
+A columnar copy of the searchable place attributes (price, latitude,
+longitude) kept in contiguous NumPy arrays next to the Repository, so
+range filters run as vectorized array operations instead of a Python
+loop over Place objects.
+"""
+
+import threading
+
+import numpy as np
+
+
+class PlaceCatalog:
+    """
+    Columnar index of places.
+
+    Each place occupies one row in four parallel arrays (id, price,
+    latitude, longitude). Rows are appended at the end (arrays double in
+    capacity when full) and removed by moving the last row into the hole,
+    so the live rows are always the first `size` entries.
+    """
+
+    def __init__(self, capacity=1024):
+        self._lock = threading.Lock()
+        self.size = 0
+        self.rows = {}  # place id -> row number
+        self.ids = np.empty(capacity, dtype=object)
+        self.prices = np.empty(capacity, dtype=np.float64)
+        self.latitudes = np.empty(capacity, dtype=np.float64)
+        self.longitudes = np.empty(capacity, dtype=np.float64)
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        """Double the capacity of every column."""
+        capacity = max(1, len(self.ids) * 2)
+        for name in ('ids', 'prices', 'latitudes', 'longitudes'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def upsert(self, place):
+        """
+        Insert a place, or refresh its row if it is already in the catalog.
+
+        Args:
+            place: A Place object
+        """
+        with self._lock:
+            row = self.rows.get(place.id)
+            if row is None:
+                if self.size == len(self.ids):
+                    self._grow()
+                row = self.size
+                self.size += 1
+                self.rows[place.id] = row
+                self.ids[row] = place.id
+            self.prices[row] = place.price
+            self.latitudes[row] = place.latitude
+            self.longitudes[row] = place.longitude
+
+    def remove(self, place_id):
+        """
+        Remove a place from the catalog, if present.
+
+        Args:
+            place_id: The ID of the place
+        """
+        with self._lock:
+            row = self.rows.pop(place_id, None)
+            if row is None:
+                return
+            last = self.size - 1
+            if row != last:
+                moved_id = self.ids[last]
+                self.ids[row] = moved_id
+                self.prices[row] = self.prices[last]
+                self.latitudes[row] = self.latitudes[last]
+                self.longitudes[row] = self.longitudes[last]
+                self.rows[moved_id] = row
+            self.ids[last] = None
+            self.size = last
+
+    def query(self, min_price=None, max_price=None, min_latitude=None,
+              max_latitude=None, min_longitude=None, max_longitude=None):
+        """
+        Return the IDs of places matching every given bound (inclusive).
+
+        Bounds left as None are not applied. Each bound is one vectorized
+        comparison over a contiguous array.
+
+        Returns:
+            A list of place IDs
+        """
+        bounds = (
+            ('prices', min_price, max_price),
+            ('latitudes', min_latitude, max_latitude),
+            ('longitudes', min_longitude, max_longitude),
+        )
+        with self._lock:
+            size = self.size
+            mask = np.ones(size, dtype=bool)
+            for name, low, high in bounds:
+                column = getattr(self, name)[:size]
+                if low is not None:
+                    mask &= column >= low
+                if high is not None:
+                    mask &= column <= high
+            return self.ids[:size][mask].tolist()
@@ -18,6 +18,175 @@ class Repository:
     def __init__(self):
         # Dictionary to store all objects: {entity_type: {id: object}}
         self.storage = {}
+        # Secondary indexes: {entity_type: {attribute: {value: id or {id: None}}}}
+        # Non-unique buckets are dicts (not sets) so results keep insertion order.
+        self.indexes = {}
+        # Which indexes are unique: {entity_type: {attribute: bool}}
+        self.unique_indexes = {}
+        # Last indexed value per object: {entity_type: {id: {attribute: value}}}
+        # Objects are mutated in place before update() is called, so this is
+        # the only way to know which index bucket an object used to live in.
+        self.indexed_values = {}
+        # Membership version per entity type, bumped when objects come or go
+        self.versions = {}
+        # Cached get_all() results: {entity_type: (version, tuple of objects)}
+        self.snapshots = {}
+
+    # ==================== INDEX MANAGEMENT ====================
+
+    def register_index(self, entity_type, attribute, unique=False):
+        """
+        Register a hash index on an attribute of an entity type.
+
+        Objects already stored are indexed immediately; after that the index
+        is kept up to date by add(), update() and delete().
+
+        Args:
+            entity_type: The class name (e.g., 'User')
+            attribute: The attribute name (e.g., 'email')
+            unique: If True, two objects may not share the same value
+
+        Raises:
+            ValueError: If unique is True and existing objects collide
+        """
+        self.indexes.setdefault(entity_type, {})[attribute] = {}
+        self.unique_indexes.setdefault(entity_type, {})[attribute] = unique
+
+        for obj in self.storage.get(entity_type, {}).values():
+            value = getattr(obj, attribute, None)
+            self._check_unique(entity_type, attribute, value, obj.id)
+            self._index_insert(entity_type, attribute, value, obj.id)
+            self.indexed_values.setdefault(entity_type, {}).setdefault(obj.id, {})[attribute] = value
+
+    def rebuild_indexes(self):
+        """
+        Rebuild every registered index from the objects currently stored.
+
+        Needed after the storage dictionary is replaced wholesale
+        (e.g., when loading a snapshot from disk).
+        """
+        self.indexed_values = {}
+        for entity_type, attributes in self.unique_indexes.items():
+            for attribute, unique in attributes.items():
+                self.register_index(entity_type, attribute, unique)
+
+    def has_index(self, entity_type, attribute):
+        """
+        Check whether an index exists for an entity type and attribute.
+
+        Returns:
+            True if find_by_attribute() can be served from an index
+        """
+        return attribute in self.indexes.get(entity_type, {})
+
+    def _index_insert(self, entity_type, attribute, value, obj_id):
+        """Put an object ID into the bucket for a value (None is not indexed)."""
+        if value is None:
+            return
+        index = self.indexes[entity_type][attribute]
+        if self.unique_indexes[entity_type][attribute]:
+            index[value] = obj_id
+        else:
+            index.setdefault(value, {})[obj_id] = None
+
+    def _index_remove(self, entity_type, attribute, value, obj_id):
+        """Take an object ID out of the bucket for a value."""
+        if value is None:
+            return
+        index = self.indexes[entity_type][attribute]
+        if self.unique_indexes[entity_type][attribute]:
+            if index.get(value) == obj_id:
+                del index[value]
+        else:
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(obj_id, None)
+                if not bucket:
+                    del index[value]
+
+    def _check_unique(self, entity_type, attribute, value, obj_id):
+        """Raise ValueError if a unique index already maps value to another object."""
+        if value is None or not self.unique_indexes[entity_type][attribute]:
+            return
+        owner_id = self.indexes[entity_type][attribute].get(value)
+        if owner_id is not None and owner_id != obj_id:
+            raise ValueError(f"{entity_type} with {attribute} '{value}' already exists")
+
+    def _reindex(self, entity_type, obj):
+        """
+        Bring every index of an entity type in line with the object's current values.
+
+        Unique constraints are checked for all attributes before anything is
+        changed, so a violation leaves the indexes untouched.
+        """
+        indexes = self.indexes.get(entity_type)
+        if not indexes:
+            return
+
+        old_values = self.indexed_values.setdefault(entity_type, {}).get(obj.id, {})
+        new_values = {attribute: getattr(obj, attribute, None) for attribute in indexes}
+
+        for attribute, value in new_values.items():
+            self._check_unique(entity_type, attribute, value, obj.id)
+
+        for attribute, value in new_values.items():
+            old_value = old_values.get(attribute)
+            if attribute in old_values and old_value == value:
+                continue
+            if attribute in old_values:
+                self._index_remove(entity_type, attribute, old_value, obj.id)
+            self._index_insert(entity_type, attribute, value, obj.id)
+
+        self.indexed_values[entity_type][obj.id] = new_values
+
+    def _unindex(self, entity_type, obj_id):
+        """Remove an object from every index of its entity type."""
+        old_values = self.indexed_values.get(entity_type, {}).pop(obj_id, None)
+        if not old_values:
+            return
+        for attribute, value in old_values.items():
+            self._index_remove(entity_type, attribute, value, obj_id)
+
+    # ==================== SNAPSHOTS ====================
+
+    def version(self, entity_type):
+        """
+        Return the membership version of an entity type.
+
+        The version changes whenever an object of that type is added,
+        deleted or replaced by a different instance.
+        """
+        return self.versions.get(entity_type, 0)
+
+    def _bump_version(self, entity_type):
+        """Record that the set of objects of an entity type has changed."""
+        self.versions[entity_type] = self.versions.get(entity_type, 0) + 1
+
+    def get_snapshot(self, entity_type):
+        """
+        Return an immutable snapshot of all objects of a type.
+
+        The snapshot is a tuple built once per version: repeated calls with
+        no add/delete in between return the very same tuple instead of
+        copying the storage again, and a snapshot handed out earlier stays
+        valid (it simply keeps the old membership) while writers continue.
+
+        Args:
+            entity_type: The class name (e.g., 'User', 'Place')
+
+        Returns:
+            A tuple of all objects of that type
+        """
+        version = self.versions.get(entity_type, 0)
+        cached = self.snapshots.get(entity_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        objects = tuple(self.storage.get(entity_type, {}).values())
+        self.snapshots[entity_type] = (version, objects)
+        return objects
+
+    # ==================== CRUD OPERATIONS ====================
 
     def add(self, obj):
         """
@@ -25,16 +194,23 @@ class Repository:
         
         Args:
             obj: The object to store (must have an 'id' attribute)
+
+        Raises:
+            ValueError: If the object violates a unique index
         """
         # Get the class name (e.g., 'User', 'Place')
         entity_type = obj.__class__.__name__
         
+        # Keep the indexes in sync (raises before storing on a duplicate)
+        self._reindex(entity_type, obj)
+
         # Initialize the entity type if it doesn't exist
         if entity_type not in self.storage:
             self.storage[entity_type] = {}
         
         # Store the object by its ID
         self.storage[entity_type][obj.id] = obj
+        self._bump_version(entity_type)
 
     def get(self, obj_id, entity_type):
         """
@@ -59,11 +235,10 @@ class Repository:
             entity_type: The class name (e.g., 'User', 'Place')
         
         Returns:
-            A list of all objects of that type
+            An immutable snapshot (tuple) of all objects of that type,
+            shared between callers until the next add or delete
         """
-        if entity_type not in self.storage:
-            return []
-        return list(self.storage[entity_type].values())
+        return self.get_snapshot(entity_type)
 
     def update(self, obj):
         """
@@ -71,10 +246,25 @@ class Repository:
         
         Args:
             obj: The object to update (must have an 'id' attribute)
+
+        Raises:
+            ValueError: If the new values violate a unique index; the
+                object's indexed attributes are then set back to their
+                last indexed values, so object and indexes still agree
         """
         entity_type = obj.__class__.__name__
         if entity_type in self.storage and obj.id in self.storage[entity_type]:
-            self.storage[entity_type][obj.id] = obj
+            try:
+                self._reindex(entity_type, obj)
+            except ValueError:
+                old_values = self.indexed_values.get(entity_type, {}).get(obj.id, {})
+                for attribute, value in old_values.items():
+                    if getattr(obj, attribute, None) != value:
+                        setattr(obj, attribute, value)
+                raise
+            if self.storage[entity_type][obj.id] is not obj:
+                self.storage[entity_type][obj.id] = obj
+                self._bump_version(entity_type)
 
     def delete(self, obj_id, entity_type):
         """
@@ -85,11 +275,16 @@ class Repository:
             entity_type: The class name (e.g., 'User', 'Place')
         """
         if entity_type in self.storage and obj_id in self.storage[entity_type]:
+            self._unindex(entity_type, obj_id)
             del self.storage[entity_type][obj_id]
+            self._bump_version(entity_type)
 
     def find_by_attribute(self, entity_type, attribute, value):
         """
         Find an object by an attribute value (e.g., find user by email).
+
+        Uses the index registered for the attribute if there is one,
+        otherwise falls back to scanning every object of that type.
         
         Args:
             entity_type: The class name (e.g., 'User')
@@ -101,8 +296,53 @@ class Repository:
         """
         if entity_type not in self.storage:
             return None
+
+        if self.has_index(entity_type, attribute):
+            if value is None:
+                return None
+            entry = self.indexes[entity_type][attribute].get(value)
+            if entry is None:
+                return None
+            if not isinstance(entry, dict):
+                return self.storage[entity_type].get(entry)
+            obj_id = next(iter(entry))
+            return self.storage[entity_type].get(obj_id)
         
         for obj in self.storage[entity_type].values():
             if hasattr(obj, attribute) and getattr(obj, attribute) == value:
                 return obj
         return None
+
+    def find_all_by_attribute(self, entity_type, attribute, value):
+        """
+        Find every object whose attribute equals a value (e.g., reviews of a place).
+
+        Uses the index registered for the attribute if there is one,
+        otherwise falls back to scanning every object of that type.
+
+        Args:
+            entity_type: The class name (e.g., 'Review')
+            attribute: The attribute name (e.g., 'place_id')
+            value: The value to search for
+
+        Returns:
+            A list of matching objects (empty if none)
+        """
+        if entity_type not in self.storage:
+            return []
+
+        objects = self.storage[entity_type]
+        if self.has_index(entity_type, attribute):
+            if value is None:
+                return []
+            entry = self.indexes[entity_type][attribute].get(value)
+            if entry is None:
+                return []
+            if not isinstance(entry, dict):
+                return [objects[entry]]
+            return [objects[obj_id] for obj_id in entry]
+
+        return [
+            obj for obj in objects.values()
+            if hasattr(obj, attribute) and getattr(obj, attribute) == value
+        ]
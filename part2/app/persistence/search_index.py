@@ -0,0 +1,148 @@
+"""
+Place Search Index
+An in-process inverted index over place titles and descriptions, kept
+next to the Repository so full-text search looks up the places holding
+each word instead of scanning every Place object.
+"""
+
+import heapq
+import math
+import re
+import threading
+
+# Title matches count this many times as much as description matches
+TITLE_WEIGHT = 10.0
+# Okapi BM25 parameters
+K1 = 1.2
+B = 0.75
+# Words of a query beyond this are ignored
+MAX_TERMS = 16
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Split text into lowercase words."""
+    return _WORD.findall(text.lower()) if text else []
+
+
+class PlaceSearchIndex:
+    """
+    Inverted index of place words.
+
+    For every word the index keeps a posting dict {place id: (count in
+    title, count in description)}; for every place it keeps its distinct
+    words and field lengths, so a place can be re-indexed or removed
+    without scanning the postings. Results are ranked with BM25, summed
+    over the two fields with the title weighted by TITLE_WEIGHT.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings = {}  # word -> {place id: (title count, description count)}
+        self.documents = {}  # place id -> (words, title length, description length)
+        self.total_title_length = 0
+        self.total_description_length = 0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _remove(self, place_id):
+        document = self.documents.pop(place_id, None)
+        if document is None:
+            return
+        words, title_length, description_length = document
+        for word in words:
+            posting = self.postings[word]
+            del posting[place_id]
+            if not posting:
+                del self.postings[word]
+        self.total_title_length -= title_length
+        self.total_description_length -= description_length
+
+    def upsert(self, place):
+        """
+        Index a place, replacing its previous words if it is already indexed.
+
+        Args:
+            place: A Place object
+        """
+        title = tokenize(place.title)
+        description = tokenize(place.description)
+        counts = {}
+        for word in title:
+            title_count, description_count = counts.get(word, (0, 0))
+            counts[word] = (title_count + 1, description_count)
+        for word in description:
+            title_count, description_count = counts.get(word, (0, 0))
+            counts[word] = (title_count, description_count + 1)
+
+        with self._lock:
+            self._remove(place.id)
+            for word, frequencies in counts.items():
+                self.postings.setdefault(word, {})[place.id] = frequencies
+            self.documents[place.id] = (frozenset(counts), len(title), len(description))
+            self.total_title_length += len(title)
+            self.total_description_length += len(description)
+
+    def remove(self, place_id):
+        """
+        Remove a place from the index, if present.
+
+        Args:
+            place_id: The ID of the place
+        """
+        with self._lock:
+            self._remove(place_id)
+
+    def search(self, text, limit, offset=0):
+        """
+        Return the IDs of places containing every word of text, best match first.
+
+        Candidates are the intersection of the words' postings, starting
+        from the shortest; only the top offset + limit are fully sorted.
+        Ties are broken by place ID so pages are stable.
+
+        Args:
+            text: The search query
+            limit: Maximum number of IDs to return
+            offset: Number of ranked IDs to skip
+
+        Returns:
+            A tuple (list of place IDs, total number of matches)
+        """
+        words = list(dict.fromkeys(tokenize(text)))[:MAX_TERMS]
+        if not words:
+            return [], 0
+
+        with self._lock:
+            postings = [self.postings.get(word) for word in words]
+            if not all(postings):
+                return [], 0
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return [], 0
+
+            count = len(self.documents)
+            average_title = self.total_title_length / count or 1.0
+            average_description = self.total_description_length / count or 1.0
+
+            def weight(frequency, length, average):
+                return frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / average))
+
+            scores = dict.fromkeys(candidates, 0.0)
+            for posting in postings:
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for place_id in candidates:
+                    title_count, description_count = posting[place_id]
+                    _, title_length, description_length = self.documents[place_id]
+                    scores[place_id] += idf * (
+                        TITLE_WEIGHT * weight(title_count, title_length, average_title)
+                        + weight(description_count, description_length, average_description)
+                    )
+
+        ranked = heapq.nsmallest(offset + limit, scores, key=lambda place_id: (-scores[place_id], place_id))
+        return ranked[offset:], len(scores)
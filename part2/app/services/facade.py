@@ -4,7 +4,9 @@ The Facade simplifies interaction between the API and data layers.
 It contains all business logic and validation rules.
 """
 
-from app.persistence.repository import Repository
+from app.persistence import create_repository
+from app.persistence.place_catalog import PlaceCatalog
+from app.persistence.search_index import PlaceSearchIndex
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
@@ -22,9 +24,49 @@ class HBnBFacade:
     - Clean interface for the Presentation layer
     """
     
-    def __init__(self):
-        # Initialize the repository (in-memory storage)
-        self.repository = Repository()
+    def __init__(self, repository=None):
+        # Initialize the repository (in-memory storage unless told otherwise)
+        self.repository = repository if repository is not None else create_repository()
+
+        # Secondary indexes for the lookups the business logic relies on
+        self.repository.register_index('User', 'email', unique=True)
+        self.repository.register_index('Place', 'owner_id')
+        self.repository.register_index('Review', 'place_id')
+        self.repository.register_index('Review', 'user_id')
+
+        # A durable repository may start out with data loaded from disk
+        self._link_relationships()
+
+        # Columnar copy of place price/coordinates for vectorized search
+        self.place_catalog = PlaceCatalog()
+        # Inverted index of place titles/descriptions for full-text search
+        self.search_index = PlaceSearchIndex()
+        for place in self.repository.get_all('Place'):
+            self.place_catalog.upsert(place)
+            self.search_index.upsert(place)
+
+    def _link_relationships(self):
+        """
+        Rebuild the relationship lists (User.places, User.reviews, Place.reviews).
+
+        These lists are derived from Place.owner, Review.place and Review.user,
+        so they are maintained in memory only and never written back through
+        the repository (that would journal a whole list on every new review).
+        After loading from disk they are rebuilt here in a single pass.
+        """
+        # Reset to None: the lists are created again on first append
+        for user in self.repository.get_all('User'):
+            user.places = None
+            user.reviews = None
+        for place in self.repository.get_all('Place'):
+            place.reviews = None
+            if place.owner:
+                place.owner.places.append(place)
+        for review in self.repository.get_all('Review'):
+            if review.place:
+                review.place.reviews.append(review)
+            if review.user:
+                review.user.reviews.append(review)
 
     # ==================== USER OPERATIONS ====================
     
@@ -79,7 +121,7 @@ class HBnBFacade:
         Retrieve all users.
         
         Returns:
-            A list of all User objects
+            An immutable snapshot (tuple) of all User objects
         """
         return self.repository.get_all('User')
 
@@ -93,10 +135,19 @@ class HBnBFacade:
         
         Returns:
             The updated User object, or None if not found
+
+        Raises:
+            ValueError: If the new email belongs to another user
         """
         user = self.repository.get(user_id, 'User')
         if not user:
             return None
+
+        # Check the unique email before the object is changed
+        if 'email' in user_data:
+            owner = self.get_user_by_email(user_data['email'])
+            if owner is not None and owner is not user:
+                raise ValueError('Email already registered')
         
         # Update the user object with provided data
         user.update(user_data)
@@ -133,6 +184,12 @@ class HBnBFacade:
         )
         
         self.repository.add(new_place)
+
+        # Keep the owner's list of places and the search indexes in sync
+        owner.add_place(new_place)
+        self.place_catalog.upsert(new_place)
+        self.search_index.upsert(new_place)
+
         return new_place
 
     def get_place(self, place_id):
@@ -152,7 +209,7 @@ class HBnBFacade:
         Retrieve all places.
         
         Returns:
-            A list of all Place objects
+            An immutable snapshot (tuple) of all Place objects
         """
         return self.repository.get_all('Place')
 
@@ -173,8 +230,57 @@ class HBnBFacade:
         
         place.update(place_data)
         self.repository.update(place)
+        self.place_catalog.upsert(place)
+        self.search_index.upsert(place)
         return place
 
+    def search_places(self, min_price=None, max_price=None, min_latitude=None,
+                      max_latitude=None, min_longitude=None, max_longitude=None):
+        """
+        Find places by price and/or location range.
+
+        The bounds are evaluated as vectorized operations over the columnar
+        place catalog rather than by iterating Place objects.
+
+        Args:
+            min_price, max_price: Price per night bounds (inclusive)
+            min_latitude, max_latitude: Latitude bounds (inclusive)
+            min_longitude, max_longitude: Longitude bounds (inclusive)
+            Any bound left as None is not applied.
+
+        Returns:
+            A list of matching Place objects
+        """
+        place_ids = self.place_catalog.query(
+            min_price=min_price,
+            max_price=max_price,
+            min_latitude=min_latitude,
+            max_latitude=max_latitude,
+            min_longitude=min_longitude,
+            max_longitude=max_longitude
+        )
+        places = (self.repository.get(place_id, 'Place') for place_id in place_ids)
+        return [place for place in places if place is not None]
+
+    def search_places_by_text(self, query, limit=20, offset=0):
+        """
+        Full-text search over place titles and descriptions.
+
+        Matches places containing every word of the query, ranked by BM25
+        with title matches weighted above description matches.
+
+        Args:
+            query: The search text
+            limit: Maximum number of places to return
+            offset: Number of ranked places to skip
+
+        Returns:
+            A tuple (list of Place objects, total number of matches)
+        """
+        place_ids, total = self.search_index.search(query, limit, offset)
+        places = (self.repository.get(place_id, 'Place') for place_id in place_ids)
+        return [place for place in places if place is not None], total
+
     # ==================== REVIEW OPERATIONS ====================
     
     def create_review(self, review_data):
@@ -201,6 +307,12 @@ class HBnBFacade:
         )
         
         self.repository.add(new_review)
+
+        # Keep the relationship lists in sync so per-place/per-user
+        # listings never need to scan every review
+        place.add_review(new_review)
+        user.add_review(new_review)
+
         return new_review
 
     def get_review(self, review_id):
@@ -220,7 +332,7 @@ class HBnBFacade:
         Retrieve all reviews.
         
         Returns:
-            A list of all Review objects
+            An immutable snapshot (tuple) of all Review objects
         """
         return self.repository.get_all('Review')
 
@@ -234,8 +346,10 @@ class HBnBFacade:
         Returns:
             A list of Review objects for that place
         """
-        all_reviews = self.repository.get_all('Review')
-        return [review for review in all_reviews if review.place.id == place_id]
+        place = self.repository.get(place_id, 'Place')
+        if not place:
+            return []
+        return list(place.reviews)
 
     def update_review(self, review_id, review_data):
         """
@@ -271,6 +385,13 @@ class HBnBFacade:
             return False
         
         self.repository.delete(review_id, 'Review')
+
+        # Remove the review from the place's and author's lists
+        if review.place:
+            review.place.remove_review(review)
+        if review.user:
+            review.user.remove_review(review)
+
         return True
 
     # ==================== AMENITY OPERATIONS ====================
@@ -306,7 +427,7 @@ class HBnBFacade:
         Retrieve all amenities.
         
         Returns:
-            A list of all Amenity objects
+            An immutable snapshot (tuple) of all Amenity objects
         """
         return self.repository.get_all('Amenity')
 
@@ -0,0 +1,110 @@
+"""
+Contention benchmark
+Hammers a repository with mixed reads and writes from N threads and
+reports throughput for each thread count.
+
+Compares the lock-striped ConcurrentRepository with the simplest safe
+alternative: the plain Repository behind one global lock.
+
+Run from the part2 directory:
+    python -m benchmarks.contention_benchmark [--threads 1 2 4 8] [--seconds 2]
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.persistence.concurrent_repository import ConcurrentRepository
+from app.persistence.repository import Repository
+
+
+class GloballyLockedRepository:
+    """The plain Repository with every call serialized by a single lock."""
+
+    def __init__(self):
+        self._repository = Repository()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self._repository, name)
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return method(*args, **kwargs)
+        return locked
+
+
+def populate(repository, users, amenities):
+    repository.register_index('User', 'email', unique=True)
+    user_ids = []
+    for i in range(users):
+        user = User('Bench', f'User{i}', f'user{i}@bench.io')
+        repository.add(user)
+        user_ids.append(user.id)
+    amenity_ids = []
+    for i in range(amenities):
+        amenity = Amenity(f'Amenity {i}')
+        repository.add(amenity)
+        amenity_ids.append(amenity.id)
+    return user_ids, amenity_ids
+
+
+def worker(repository, user_ids, amenity_ids, write_ratio, deadline, counts, slot):
+    rng = random.Random(slot)
+    done = 0
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        if roll < write_ratio:
+            user = repository.get(rng.choice(user_ids), 'User')
+            user.first_name = f'Bench{done}'
+            repository.update(user)
+        elif roll < 0.5:
+            repository.get(rng.choice(amenity_ids), 'Amenity')
+        elif roll < 0.8:
+            repository.find_by_attribute('User', 'email', f'user{rng.randrange(len(user_ids))}@bench.io')
+        else:
+            repository.get_all('Amenity')
+        done += 1
+    counts[slot] = done
+
+
+def run(repository_class, threads, seconds, write_ratio, users, amenities):
+    repository = repository_class()
+    user_ids, amenity_ids = populate(repository, users, amenities)
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+    pool = [
+        threading.Thread(target=worker, args=(repository, user_ids, amenity_ids,
+                                              write_ratio, deadline, counts, slot))
+        for slot in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return sum(counts) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--amenities', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f'{"threads":>8} {"global lock":>14} {"striped":>14}')
+    for threads in args.threads:
+        global_ops = run(GloballyLockedRepository, threads, args.seconds,
+                         args.write_ratio, args.users, args.amenities)
+        striped_ops = run(ConcurrentRepository, threads, args.seconds,
+                          args.write_ratio, args.users, args.amenities)
+        print(f'{threads:>8} {global_ops:>10.0f} op/s {striped_ops:>10.0f} op/s')
+
+
+if __name__ == '__main__':
+    main()
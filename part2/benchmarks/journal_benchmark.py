@@ -0,0 +1,109 @@
+"""
+Journal benchmark
+Measures the per-operation cost of the durable (journaled) repository
+and how long it takes to start up from a snapshot plus journal tail.
+
+Run from the part2 directory:
+    python -m benchmarks.journal_benchmark [--users N] [--tail N]
+"""
+
+import argparse
+import tempfile
+import time
+
+from app.persistence.journal import JournaledRepository
+from app.persistence.repository import Repository
+from app.services.facade import HBnBFacade
+
+
+def populate(facade, users, places_per_user=2, reviews_per_place=3, offset=0):
+    """Create a realistic object graph (users, their places and reviews)."""
+    created = []
+    for i in range(offset, offset + users):
+        created.append(facade.create_user({
+            'first_name': 'Bench',
+            'last_name': f'User{i}',
+            'email': f'user{i}@bench.io'
+        }))
+    for i, user in enumerate(created):
+        for j in range(places_per_user):
+            place = facade.create_place({
+                'title': f'Place {j}',
+                'description': 'Benchmark place',
+                'price': 50.0 + j,
+                'latitude': 10.0,
+                'longitude': 20.0,
+                'owner_id': user.id
+            })
+            for k in range(reviews_per_place):
+                facade.create_review({
+                    'text': 'Nice',
+                    'rating': 1 + k % 5,
+                    'place_id': place.id,
+                    'user_id': created[(i + k + 1) % len(created)].id
+                })
+
+
+def time_writes(repository, count):
+    """Return microseconds per user creation on a repository."""
+    facade = HBnBFacade(repository)
+    start = time.perf_counter()
+    for i in range(count):
+        facade.create_user({
+            'first_name': 'Write',
+            'last_name': 'Bench',
+            'email': f'write{i}@bench.io'
+        })
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def time_startup(data_dir):
+    """Return (seconds, number of users) to reopen a journaled repository."""
+    start = time.perf_counter()
+    repository = JournaledRepository(data_dir, snapshot_interval=None, snapshot_threshold=None)
+    HBnBFacade(repository)  # indexes and relationship lists are part of startup
+    elapsed = time.perf_counter() - start
+    users = len(repository.get_all('User'))
+    repository.close()
+    return elapsed, users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=20000, help='users in the snapshot')
+    parser.add_argument('--tail', type=int, default=2000, help='users written after the snapshot')
+    parser.add_argument('--writes', type=int, default=20000, help='writes for the overhead test')
+    parser.add_argument('--fsync-writes', type=int, default=500, help='writes for the fsync test')
+    args = parser.parse_args()
+
+    print('== Write overhead (create_user) ==')
+    print(f'in-memory            {time_writes(Repository(), args.writes):8.1f} us/op')
+    with tempfile.TemporaryDirectory() as data_dir:
+        repository = JournaledRepository(data_dir, snapshot_interval=None, snapshot_threshold=None)
+        print(f'journal (flush)      {time_writes(repository, args.writes):8.1f} us/op')
+        repository.close()
+    with tempfile.TemporaryDirectory() as data_dir:
+        repository = JournaledRepository(data_dir, fsync=True, snapshot_interval=None,
+                                         snapshot_threshold=None)
+        print(f'journal (fsync)      {time_writes(repository, args.fsync_writes):8.1f} us/op')
+        repository.close()
+
+    print('== Startup ==')
+    with tempfile.TemporaryDirectory() as data_dir:
+        repository = JournaledRepository(data_dir, snapshot_interval=None, snapshot_threshold=None)
+        facade = HBnBFacade(repository)
+        populate(facade, args.users)
+        repository.close()
+        elapsed, users = time_startup(data_dir)
+        print(f'journal only         {elapsed:8.3f} s  ({users} users)')
+
+        repository = JournaledRepository(data_dir, snapshot_interval=None, snapshot_threshold=None)
+        repository.snapshot()
+        populate(HBnBFacade(repository), args.tail, offset=args.users)
+        repository.close()
+        elapsed, users = time_startup(data_dir)
+        print(f'snapshot + tail      {elapsed:8.3f} s  ({users} users, {args.tail} in the tail)')
+
+
+if __name__ == '__main__':
+    main()
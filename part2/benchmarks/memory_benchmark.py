@@ -0,0 +1,134 @@
+"""
+Memory benchmark
+Reports the bytes each resident entity costs, per model class, for the
+compact (__slots__) models next to the previous __dict__-based layout.
+
+The "before" column uses stand-in classes that reproduce the old layout:
+a per-instance __dict__, two separate datetime objects and eagerly
+created relationship lists.
+
+Run from the part2 directory:
+    python -m benchmarks.memory_benchmark [--count N]
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carla', 'David', 'Emma', 'Farid', 'Grace', 'Hugo']
+LAST_NAMES = ['Martin', 'Bernard', 'Dubois', 'Smith', 'Garcia', 'Rossi']
+
+
+class LegacyBase:
+    def __init__(self):
+        self.id = str(uuid.uuid4())
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+class LegacyUser(LegacyBase):
+    def __init__(self, first_name, last_name, email, is_admin=False):
+        super().__init__()
+        self.first_name = first_name
+        self.last_name = last_name
+        self.email = email
+        self.is_admin = is_admin
+        self.places = []
+        self.reviews = []
+
+
+class LegacyPlace(LegacyBase):
+    def __init__(self, title, description, price, latitude, longitude, owner):
+        super().__init__()
+        self.title = title
+        self.description = description
+        self.price = price
+        self.latitude = latitude
+        self.longitude = longitude
+        self.owner = owner
+        self.amenities = []
+        self.reviews = []
+
+
+class LegacyReview(LegacyBase):
+    def __init__(self, text, rating, place, user):
+        super().__init__()
+        self.text = text
+        self.rating = rating
+        self.place = place
+        self.user = user
+
+
+class LegacyAmenity(LegacyBase):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+
+def user_args(i):
+    # Build the strings at runtime, as they would arrive from JSON payloads
+    return (FIRST_NAMES[i % len(FIRST_NAMES)].encode().decode(),
+            LAST_NAMES[i % len(LAST_NAMES)].encode().decode(),
+            f'user{i}@bench.io')
+
+
+def measure(factory, count):
+    """Return the bytes allocated per object by factory(i), objects kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of the entity cost
+    list_overhead = 8 * len(objects)
+    del objects
+    return (after - before - list_overhead) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    owner = User('Owner', 'Bench', 'owner@bench.io')
+    legacy_owner = LegacyUser('Owner', 'Bench', 'owner@bench.io')
+    place = Place('Loft', 'Nice loft', 80.0, 1.0, 2.0, owner)
+    legacy_place = LegacyPlace('Loft', 'Nice loft', 80.0, 1.0, 2.0, legacy_owner)
+    text = 'Great stay, would come back'
+
+    cases = [
+        ('User',
+         lambda i: LegacyUser(*user_args(i)),
+         lambda i: User(*user_args(i))),
+        ('Place',
+         lambda i: LegacyPlace(f'Place {i}', text, 10.0 + i, rng.uniform(-90, 90),
+                               rng.uniform(-180, 180), legacy_owner),
+         lambda i: Place(f'Place {i}', text, 10.0 + i, rng.uniform(-90, 90),
+                         rng.uniform(-180, 180), owner)),
+        ('Review',
+         lambda i: LegacyReview(text, 1 + i % 5, legacy_place, legacy_owner),
+         lambda i: Review(text, 1 + i % 5, place, owner)),
+        ('Amenity',
+         lambda i: LegacyAmenity(f'Amenity {i}'),
+         lambda i: Amenity(f'Amenity {i}')),
+    ]
+
+    print(f'{"model":<10} {"before":>12} {"after":>12} {"saved":>8}')
+    for name, legacy_factory, compact_factory in cases:
+        before = measure(legacy_factory, args.count)
+        after = measure(compact_factory, args.count)
+        print(f'{name:<10} {before:>8.0f} B/e {after:>8.0f} B/e {1 - after / before:>7.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Place catalog benchmark
+Compares place filtering through the columnar NumPy catalog with the
+object-iteration path (looping over get_all_places) at several catalog
+sizes.
+
+Run from the part2 directory:
+    python -m benchmarks.place_catalog_benchmark [--sizes 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from app.models.place import Place
+from app.models.user import User
+from app.services.facade import HBnBFacade
+from app.persistence.repository import Repository
+
+QUERIES = {
+    'price range': dict(min_price=80.0, max_price=120.0),
+    'price + bbox': dict(max_price=150.0, min_latitude=40.0, max_latitude=50.0,
+                         min_longitude=-5.0, max_longitude=10.0),
+}
+
+
+def build(size):
+    """Fill a facade with `size` random places (bypassing per-call validation cost)."""
+    facade = HBnBFacade(Repository())
+    owner = User('Bench', 'Owner', 'owner@bench.io')
+    facade.repository.add(owner)
+    rng = random.Random(size)
+    for i in range(size):
+        place = Place(f'Place {i}', 'Benchmark place', rng.uniform(10, 500),
+                      rng.uniform(-90, 90), rng.uniform(-180, 180), owner)
+        facade.repository.add(place)
+        facade.place_catalog.upsert(place)
+    return facade
+
+
+def scan(facade, min_price=None, max_price=None, min_latitude=None,
+         max_latitude=None, min_longitude=None, max_longitude=None):
+    """The object-iteration path the catalog replaces."""
+    return [
+        place for place in facade.get_all_places()
+        if (min_price is None or place.price >= min_price)
+        and (max_price is None or place.price <= max_price)
+        and (min_latitude is None or place.latitude >= min_latitude)
+        and (max_latitude is None or place.latitude <= max_latitude)
+        and (min_longitude is None or place.longitude >= min_longitude)
+        and (max_longitude is None or place.longitude <= max_longitude)
+    ]
+
+
+def best_of(function, repeat):
+    """Return the best wall time in milliseconds and the last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"places":>9} {"query":<14} {"matches":>8} {"objects":>11} '
+          f'{"catalog ids":>12} {"catalog+get":>12}')
+    for size in args.sizes:
+        facade = build(size)
+        for name, bounds in QUERIES.items():
+            scan_ms, expected = best_of(lambda: scan(facade, **bounds), args.repeat)
+            ids_ms, ids = best_of(lambda: facade.place_catalog.query(**bounds), args.repeat)
+            search_ms, found = best_of(lambda: facade.search_places(**bounds), args.repeat)
+            assert len(ids) == len(found) == len(expected)
+            print(f'{size:>9} {name:<14} {len(found):>8} {scan_ms:>8.1f} ms '
+                  f'{ids_ms:>9.1f} ms {search_ms:>9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Search index benchmark
+Compares full-text place search through the inverted index with the
+object-iteration path (tokenizing every place's title and description
+per query) at several catalog sizes.
+
+Run from the part2 directory:
+    python -m benchmarks.search_index_benchmark [--sizes 100000]
+"""
+
+import argparse
+import random
+import time
+
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.repository import Repository
+from app.persistence.search_index import tokenize
+from app.services.facade import HBnBFacade
+
+VOCABULARY_SIZE = 5000
+
+QUERIES = {
+    'common word': 'w1',
+    'two common words': 'w1 w2',
+    'rare word': 'w997',
+    'no match': 'absent',
+}
+
+
+def random_text(rng, words):
+    """Zipf-like words: low numbers are common, high ones rare."""
+    return ' '.join(f'w{int(rng.paretovariate(1.0)) % VOCABULARY_SIZE}' for _ in range(words))
+
+
+def build(size):
+    """Fill a facade with `size` random places (bypassing per-call validation cost)."""
+    facade = HBnBFacade(Repository())
+    owner = User('Bench', 'Owner', 'owner@bench.io')
+    facade.repository.add(owner)
+    rng = random.Random(size)
+    for _ in range(size):
+        place = Place(random_text(rng, 4), random_text(rng, 30), 100.0, 0.0, 0.0, owner)
+        facade.repository.add(place)
+        facade.search_index.upsert(place)
+    return facade
+
+
+def scan(facade, query):
+    """The object-iteration path the index replaces (unranked)."""
+    words = set(tokenize(query))
+    return [
+        place for place in facade.get_all_places()
+        if words <= set(tokenize(place.title)) | set(tokenize(place.description))
+    ]
+
+
+def best_of(function, repeat):
+    """Return the best wall time in milliseconds and the last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000])
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"places":>9} {"query":<17} {"matches":>8} {"scan":>11} {"index":>11}')
+    for size in args.sizes:
+        facade = build(size)
+        for name, query in QUERIES.items():
+            scan_ms, expected = best_of(lambda: scan(facade, query), args.repeat)
+            index_ms, (found, total) = best_of(
+                lambda: facade.search_places_by_text(query, args.limit), args.repeat
+            )
+            assert total == len(expected)
+            print(f'{size:>9} {name:<17} {total:>8} {scan_ms:>8.1f} ms {index_ms:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,9 @@ from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from app.models.base_model import db
+from app.passwords import password_hasher
+from app.persistence.sqlite import apply_pragmas, sqlite_pragmas
+from app.persistence.unit_of_work import enable_savepoints
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
@@ -14,6 +17,9 @@ def create_app(config_class="config.DevelopmentConfig"):
     app.config["JWT_SECRET_KEY"] = app.config["SECRET_KEY"]
 
     db.init_app(app)
+    with app.app_context():
+        apply_pragmas(db.engine, sqlite_pragmas(app.config))
+        enable_savepoints(db.engine)
     bcrypt.init_app(app)
     jwt.init_app(app)
 
@@ -22,4 +28,17 @@ def create_app(config_class="config.DevelopmentConfig"):
     from app.api import blueprint
     app.register_blueprint(blueprint)
 
+    from app.commands import register_commands
+    register_commands(app)
+
+    from app.services.facade import facade
+    facade.configure_caches(app.config)
+
+    password_hasher.configure(
+        log_rounds=app.config["BCRYPT_LOG_ROUNDS"],
+        workers=app.config["PASSWORD_HASH_WORKERS"],
+        max_pending=app.config["PASSWORD_HASH_MAX_PENDING"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT"]
+    )
+
     return app
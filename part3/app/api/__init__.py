@@ -5,6 +5,8 @@ from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.auth import auth_api, protected_api
+from app.api.v1.admin import api as admin_ns
+from app.passwords import PasswordHasherBusy
 
 blueprint = Blueprint('api', __name__, url_prefix='/api/v1')
 
@@ -21,3 +23,9 @@ api.add_namespace(places_ns, path='/places')
 api.add_namespace(reviews_ns, path='/reviews')
 api.add_namespace(auth_api, path='/auth')
 api.add_namespace(protected_api, path='')
+api.add_namespace(admin_ns, path='/admin')
+
+
+@api.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(error):
+    return {'message': str(error)}, 503, {'Retry-After': '1'}
@@ -0,0 +1,17 @@
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt
+from app.services.facade import facade
+
+api = Namespace('admin', description='Monitoring operations (admin only)')
+
+
+@api.route('/cache-stats')
+class CacheStats(Resource):
+    @jwt_required()
+    @api.doc('get_cache_stats')
+    def get(self):
+        """Entity cache hit/miss/eviction counters and sizes per entity type."""
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            api.abort(403, "Admin privileges required")
+        return facade.get_cache_stats(), 200
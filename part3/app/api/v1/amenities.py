@@ -1,6 +1,13 @@
-from flask_restx import Namespace, Resource, fields
+from functools import partial
+
+from flask import request
+from flask_restx import Namespace, Resource, fields, marshal
 from flask_jwt_extended import jwt_required, get_jwt
 from app.services.facade import facade
+from app.api.v1.pagination import PAGINATION_PARAMS, is_paginated, paginate
+from app.api.v1.streaming import streamed
+from app.api.v1.etags import conditional, collection_etag, entity_etag
+from app.api.v1.bulk import MAX_BULK_ITEMS, bulk_response, validate_items
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -12,21 +19,41 @@ amenity_output_model = api.model('AmenityOutput', {
     'id': fields.String(description='Amenity ID'),
     'name': fields.String(description='Name'),
     'created_at': fields.String(description='Creation timestamp'),
-    'updated_at': fields.String(description='Last update timestamp')
+    'updated_at': fields.String(description='Last update timestamp'),
+    'place_count': fields.Integer(description='Number of linked places (with include=place_count)')
+})
+
+bulk_result_model = api.model('AmenityBulkResult', {
+    'created': fields.List(fields.Raw, description='[{index, id}] of the created items'),
+    'errors': fields.List(fields.Raw, description='[{index, errors}] of the rejected items')
 })
 
+INCLUDE_PARAMS = {'include': 'Set to place_count to add the number of linked places'}
+
+
+def with_place_counts(amenities):
+    """Attach place_count when requested, counted in SQL without loading places."""
+    if request.args.get('include') == 'place_count':
+        counts = facade.get_amenity_place_counts([amenity.id for amenity in amenities])
+        for amenity in amenities:
+            amenity.place_count = counts[amenity.id]
+    return amenities
+
 
 @api.route('/')
 class AmenityList(Resource):
-    @api.doc('list_amenities')
-    @api.marshal_list_with(amenity_output_model)
+    @conditional(lambda: collection_etag('amenities', 'places'))
+    @streamed(lambda: None if is_paginated() else map(with_place_counts, facade.iter_amenities('summary')),
+              partial(marshal, fields=amenity_output_model, skip_none=True))
+    @api.doc('list_amenities', params={**PAGINATION_PARAMS, **INCLUDE_PARAMS})
+    @api.marshal_list_with(amenity_output_model, skip_none=True)
     def get(self):
-        amenities = facade.get_all_amenities()
-        return amenities, 200
+        amenities, headers = paginate(api, partial(facade.get_amenities_page, profile='summary'))
+        return with_place_counts(amenities), 200, headers
 
     @jwt_required()
     @api.expect(amenity_model, validate=True)
-    @api.marshal_with(amenity_output_model, code=201)
+    @api.marshal_with(amenity_output_model, code=201, skip_none=True)
     def post(self):
         claims = get_jwt()
         if not claims.get('is_admin', False):
@@ -37,28 +64,43 @@ class AmenityList(Resource):
         return new_amenity, 201
 
 
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @jwt_required()
+    @api.doc('create_amenities_bulk', description=f'Create up to {MAX_BULK_ITEMS} amenities in one transaction')
+    @api.expect([amenity_model])
+    @api.response(201, 'Some or all amenities created', bulk_result_model)
+    def post(self):
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            api.abort(403, "Admin privileges required")
+
+        valid, errors = validate_items(api, amenity_model)
+        results = facade.create_amenities([item for _, item in valid])
+        return bulk_response(valid, results, errors)
+
+
 @api.route('/<string:amenity_id>')
 class AmenityDetail(Resource):
-    @api.doc('get_amenity')
-    @api.marshal_with(amenity_output_model)
+    @conditional(lambda amenity_id: entity_etag(facade.get_amenity(amenity_id, 'summary', cached=False), 'places'))
+    @api.doc('get_amenity', params=INCLUDE_PARAMS)
+    @api.marshal_with(amenity_output_model, skip_none=True)
     def get(self, amenity_id):
-        amenity = facade.get_amenity(amenity_id)
+        amenity = facade.get_amenity(amenity_id, 'summary', cached=False)
         if not amenity:
             api.abort(404, f"Amenity {amenity_id} not found")
-        return amenity, 200
+        return with_place_counts([amenity])[0], 200
 
     @jwt_required()
     @api.expect(amenity_model, validate=True)
-    @api.marshal_with(amenity_output_model)
+    @api.marshal_with(amenity_output_model, skip_none=True)
     def put(self, amenity_id):
         claims = get_jwt()
         if not claims.get('is_admin', False):
             api.abort(403, "Admin privileges required")
 
-        amenity = facade.get_amenity(amenity_id)
-        if not amenity:
-            api.abort(404, f"Amenity {amenity_id} not found")
-
         amenity_data = api.payload
         updated_amenity = facade.update_amenity(amenity_id, amenity_data)
+        if not updated_amenity:
+            api.abort(404, f"Amenity {amenity_id} not found")
         return updated_amenity, 200
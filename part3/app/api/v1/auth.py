@@ -17,8 +17,8 @@ class Login(Resource):
     def post(self):
         credentials = auth_api.payload
 
-        user = facade.get_user_by_email(credentials["email"])
-        if not user or not user.verify_password(credentials["password"]):
+        user = facade.authenticate(credentials["email"], credentials["password"])
+        if not user:
             return {"error": "Invalid credentials"}, 401
 
         access_token = create_access_token(
@@ -0,0 +1,43 @@
+from jsonschema import Draft4Validator
+
+MAX_BULK_ITEMS = 1000
+# Every user costs one bcrypt hash, so user batches are kept smaller
+MAX_BULK_USERS = 100
+
+
+def validate_items(api, model, max_items=MAX_BULK_ITEMS):
+    """
+    Validate a bulk payload (a JSON list) item by item against a model.
+
+    Returns (valid, errors): valid is a list of (index, item) and errors a
+    list of {"index", "errors"} for the items that failed validation.
+    """
+    payload = api.payload
+    if not isinstance(payload, list) or not (1 <= len(payload) <= max_items):
+        api.abort(400, f"Payload must be a list of 1 to {max_items} items")
+
+    validator = Draft4Validator(model.__schema__)
+    valid, errors = [], []
+    for index, item in enumerate(payload):
+        messages = [error.message for error in validator.iter_errors(item)]
+        if messages:
+            errors.append({'index': index, 'errors': messages})
+        else:
+            valid.append((index, item))
+    return valid, errors
+
+
+def bulk_response(valid, results, errors):
+    """
+    Merge the facade's per-item results into the response body.
+
+    Status is 201 if at least one item was created, else 400.
+    """
+    created = []
+    for (index, _), result in zip(valid, results):
+        if isinstance(result, str):
+            errors.append({'index': index, 'errors': [result]})
+        else:
+            created.append({'index': index, 'id': result.id})
+    errors.sort(key=lambda error: error['index'])
+    return {'created': created, 'errors': errors}, 201 if created else 400
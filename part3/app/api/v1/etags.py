@@ -0,0 +1,64 @@
+import hashlib
+from functools import wraps
+
+from flask import Response, make_response, request
+from werkzeug.http import quote_etag
+
+from app.services.facade import facade
+from app.api.v1.streaming import wants_ndjson
+
+
+def make_etag(*parts):
+    """Strong ETag (unquoted) for a representation identified by parts."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def collection_etag(*collections):
+    """ETag of a list: the versions of the collections it shows, plus its query and format."""
+    versions = facade.get_collection_versions(*collections)
+    return make_etag(request.path, request.query_string, wants_ndjson(), *zip(collections, versions))
+
+
+def entity_etag(entity, *collections):
+    """ETag of one entity: its updated_at, plus the versions of what it embeds."""
+    if entity is None:
+        return None
+    versions = facade.get_collection_versions(*collections) if collections else []
+    return make_etag(request.path, request.query_string, entity.id,
+                     str(entity.updated_at), *zip(collections, versions))
+
+
+def conditional(compute_etag):
+    """
+    Conditional GET for a resource method.
+
+    compute_etag(**view_args) returns the current ETag, or None (e.g. when
+    the entity does not exist) to skip conditional handling. A request
+    whose If-None-Match already holds that ETag gets an empty 304 before
+    the handler queries or serializes anything; other responses carry
+    the ETag. Must be applied outside the marshalling decorators.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            etag = compute_etag(**kwargs)
+            if etag is None:
+                return method(self, *args, **kwargs)
+
+            headers = {'ETag': quote_etag(etag), 'Cache-Control': 'no-cache'}
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+                response.headers.update(headers)
+                return response
+
+            result = method(self, *args, **kwargs)
+            if isinstance(result, Response):
+                result.headers.update(headers)
+                return result
+            if not isinstance(result, tuple):
+                result = (result, 200)
+            if len(result) == 3:
+                return result[0], result[1], {**result[2], **headers}
+            return result[0], result[1], headers
+        return wrapper
+    return decorator
@@ -0,0 +1,44 @@
+from urllib.parse import urlencode
+
+from flask import request
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+PAGINATION_PARAMS = {
+    'limit': f'Page size (default {DEFAULT_PAGE_SIZE}, max {MAX_PAGE_SIZE})',
+    'cursor': 'Opaque cursor from the previous page (Link: rel="next")'
+}
+
+
+def is_paginated():
+    """Pagination is opt-in so existing clients keep getting the full list."""
+    return 'limit' in request.args or 'cursor' in request.args
+
+
+def paginate(api, get_page):
+    """
+    Fetch one page with get_page(limit, cursor).
+
+    Returns (items, headers); when there is a next page the headers carry
+    its URL in a Link rel="next" header and its cursor in X-Next-Cursor.
+    """
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if not (1 <= limit <= MAX_PAGE_SIZE):
+        api.abort(400, f"'limit' must be an integer between 1 and {MAX_PAGE_SIZE}")
+
+    try:
+        items, next_cursor = get_page(limit, request.args.get('cursor'))
+    except ValueError:
+        api.abort(400, "Invalid cursor")
+
+    headers = {}
+    if next_cursor:
+        args = request.args.to_dict()
+        args.update(limit=limit, cursor=next_cursor)
+        headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+        headers['X-Next-Cursor'] = next_cursor
+    return items, headers
@@ -1,6 +1,14 @@
+from functools import partial
+
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services.facade import facade
+from app.persistence.place_repository import PLACE_SORT_ORDERS, search_terms
+from app.api.v1.pagination import PAGINATION_PARAMS, is_paginated, paginate
+from app.api.v1.streaming import streamed
+from app.api.v1.etags import conditional, collection_etag, entity_etag
+from app.api.v1.bulk import MAX_BULK_ITEMS, bulk_response, validate_items
 
 api = Namespace('places', description='Place operations')
 
@@ -10,7 +18,13 @@ place_model = api.model('Place', {
     'price': fields.Float(required=True, description='Price per night'),
     'latitude': fields.Float(required=True, description='Latitude coordinate'),
     'longitude': fields.Float(required=True, description='Longitude coordinate'),
-    'owner_id': fields.String(description='ID of the owner (ignored, taken from token)')
+    'owner_id': fields.String(description='ID of the owner (ignored, taken from token)'),
+    'amenities': fields.List(fields.String, description='IDs of amenities to link')
+})
+
+bulk_result_model = api.model('PlaceBulkResult', {
+    'created': fields.List(fields.Raw, description='[{index, id}] of the created items'),
+    'errors': fields.List(fields.Raw, description='[{index, errors}] of the rejected items')
 })
 
 place_update_model = api.model('PlaceUpdate', {
@@ -22,6 +36,75 @@ place_update_model = api.model('PlaceUpdate', {
 })
 
 
+MAX_NEAREST = 100
+
+
+def parse_numbers(name, count):
+    try:
+        numbers = [float(part) for part in request.args[name].split(',')]
+    except ValueError:
+        numbers = []
+    if len(numbers) != count:
+        api.abort(400, f"'{name}' must be {count} comma-separated numbers")
+    return numbers
+
+
+def check_coordinates(name, latitude, longitude):
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        api.abort(400, f"'{name}' has an out-of-range latitude or longitude")
+
+
+def parse_listing_args():
+    """Read ?min_price=, ?max_price= and ?sort= for the plain listing."""
+    filters = {}
+    for name in ('min_price', 'max_price'):
+        if name in request.args:
+            try:
+                filters[name] = float(request.args[name])
+            except ValueError:
+                api.abort(400, f"'{name}' must be a number")
+    sort = request.args.get('sort')
+    if sort is not None and sort not in PLACE_SORT_ORDERS:
+        api.abort(400, f"'sort' must be one of: {', '.join(PLACE_SORT_ORDERS)}")
+    return filters, sort
+
+
+def find_near_places():
+    """Handle ?near=lat,lon with either &radius_km= or &k= (nearest neighbours)."""
+    latitude, longitude = parse_numbers('near', 2)
+    check_coordinates('near', latitude, longitude)
+
+    if 'k' in request.args:
+        try:
+            k = int(request.args['k'])
+        except ValueError:
+            k = 0
+        if not (1 <= k <= MAX_NEAREST):
+            api.abort(400, f"'k' must be an integer between 1 and {MAX_NEAREST}")
+        return facade.get_nearest_places(latitude, longitude, k)
+
+    if 'radius_km' in request.args:
+        try:
+            radius_km = float(request.args['radius_km'])
+        except ValueError:
+            radius_km = 0
+        if radius_km <= 0:
+            api.abort(400, "'radius_km' must be a positive number")
+        return facade.get_places_within_radius(latitude, longitude, radius_km)
+
+    api.abort(400, "'near' requires either 'radius_km' or 'k'")
+
+
+def find_bbox_places():
+    """Handle ?bbox=min_lat,min_lon,max_lat,max_lon (min_lon > max_lon wraps)."""
+    min_lat, min_lon, max_lat, max_lon = parse_numbers('bbox', 4)
+    check_coordinates('bbox', min_lat, min_lon)
+    check_coordinates('bbox', max_lat, max_lon)
+    if min_lat > max_lat:
+        api.abort(400, "'bbox' minimum latitude is greater than its maximum")
+    return facade.get_places_in_bbox(min_lat, min_lon, max_lat, max_lon)
+
+
 def serialize_review(review):
     return {
         "id": review.id,
@@ -58,6 +141,11 @@ def serialize_place(place):
         "latitude": place.latitude,
         "longitude": place.longitude,
         "owner_id": place.owner_id,
+        "review_count": place.review_count,
+        "rating_avg": round(place.rating_avg, 2) if place.review_count else None,
+        "rating_histogram": {
+            str(rating): getattr(place, f"rating_{rating}") for rating in range(1, 6)
+        },
         "reviews": reviews,
         "amenities": amenities,
         "created_at": str(place.created_at),
@@ -65,12 +153,42 @@ def serialize_place(place):
     }
 
 
+def iter_listing():
+    """Batches of the plain, unpaginated listing, which is streamed; None for the other modes."""
+    if 'near' in request.args or 'bbox' in request.args or is_paginated():
+        return None
+    filters, sort = parse_listing_args()
+    return facade.iter_places(sort=sort, **filters)
+
+
 @api.route('/')
 class PlaceList(Resource):
-    @api.doc('list_places')
+    @conditional(lambda: collection_etag('places', 'reviews', 'amenities'))
+    @streamed(iter_listing, serialize_place)
+    @api.doc('list_places', params={
+        'near': 'lat,lon to search around (with radius_km or k)',
+        'radius_km': 'Search radius in kilometers around near',
+        'k': f'Number of nearest places to near (max {MAX_NEAREST})',
+        'bbox': 'min_lat,min_lon,max_lat,max_lon bounding box',
+        'min_price': 'Minimum price per night',
+        'max_price': 'Maximum price per night',
+        'sort': f"Sort order: {', '.join(PLACE_SORT_ORDERS)}",
+        **PAGINATION_PARAMS
+    })
     def get(self):
-        places = facade.get_all_places()
-        return [serialize_place(place) for place in places], 200
+        if 'near' in request.args:
+            return [
+                dict(serialize_place(place), distance_km=round(distance, 3))
+                for place, distance in find_near_places()
+            ], 200
+
+        if 'bbox' in request.args:
+            return [serialize_place(place) for place in find_bbox_places()], 200
+
+        filters, sort = parse_listing_args()
+        get_page = partial(facade.get_places_page, sort=sort or 'created_at', **filters)
+        places, headers = paginate(api, get_page)
+        return [serialize_place(place) for place in places], 200, headers
 
     @jwt_required()
     @api.expect(place_model, validate=True)
@@ -86,11 +204,41 @@ class PlaceList(Resource):
         return serialize_place(new_place), 201
 
 
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @jwt_required()
+    @api.doc('create_places_bulk', description=f'Create up to {MAX_BULK_ITEMS} places in one transaction')
+    @api.expect([place_model])
+    @api.response(201, 'Some or all places created', bulk_result_model)
+    def post(self):
+        valid, errors = validate_items(api, place_model)
+        results = facade.create_places([item for _, item in valid], get_jwt_identity())
+        return bulk_response(valid, results, errors)
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @conditional(lambda: collection_etag('places', 'reviews', 'amenities'))
+    @api.doc('search_places', params={
+        'q': 'Words to find in the title or description (all of them must appear)',
+        **PAGINATION_PARAMS
+    })
+    def get(self):
+        """Full-text search over titles and descriptions, best matches first, in pages."""
+        query_text = request.args.get('q', '')
+        if not search_terms(query_text):
+            api.abort(400, "'q' must contain at least one word")
+        places, headers = paginate(api, partial(facade.search_places_page, query_text))
+        return [serialize_place(place) for place in places], 200, headers
+
+
 @api.route('/<string:place_id>')
 class PlaceDetail(Resource):
+    @conditional(lambda place_id: entity_etag(
+        facade.get_place(place_id, 'summary', cached=False), 'reviews', 'amenities'))
     @api.doc('get_place')
     def get(self, place_id):
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, 'detail', cached=False)
         if not place:
             api.abort(404, f"Place {place_id} not found")
         return serialize_place(place), 200
@@ -98,7 +246,7 @@ class PlaceDetail(Resource):
     @jwt_required()
     @api.expect(place_update_model, validate=True)
     def put(self, place_id):
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, 'summary', cached=False)
         if not place:
             api.abort(404, f"Place {place_id} not found")
 
@@ -1,19 +1,30 @@
-from flask_restx import Namespace, Resource, fields
+from functools import partial
+
+from flask_restx import Namespace, Resource, fields, marshal
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services.facade import facade
+from app.api.v1.pagination import PAGINATION_PARAMS, is_paginated, paginate
+from app.api.v1.streaming import streamed
+from app.api.v1.etags import conditional, collection_etag, entity_etag
+from app.api.v1.bulk import MAX_BULK_ITEMS, bulk_response, validate_items
 
 api = Namespace('reviews', description='Review operations')
 
 review_model = api.model('Review', {
     'text': fields.String(required=True, description='Review text'),
-    'rating': fields.Integer(required=True, description='Rating (1-5)'),
+    'rating': fields.Integer(required=True, min=1, max=5, description='Rating (1-5)'),
     'place_id': fields.String(required=True, description='ID of the place being reviewed'),
     'user_id': fields.String(description='ID of the user writing the review (ignored, taken from token)')
 })
 
 review_update_model = api.model('ReviewUpdate', {
     'text': fields.String(description='Review text'),
-    'rating': fields.Integer(description='Rating (1-5)')
+    'rating': fields.Integer(min=1, max=5, description='Rating (1-5)')
+})
+
+bulk_result_model = api.model('ReviewBulkResult', {
+    'created': fields.List(fields.Raw, description='[{index, id}] of the created items'),
+    'errors': fields.List(fields.Raw, description='[{index, errors}] of the rejected items')
 })
 
 review_output_model = api.model('ReviewOutput', {
@@ -27,13 +38,23 @@ review_output_model = api.model('ReviewOutput', {
 })
 
 
+def abort_missing_or_forbidden(review_id):
+    """After a write matched no row: 404 if the review does not exist, else 403."""
+    if not facade.review_exists(id=review_id):
+        api.abort(404, f"Review {review_id} not found")
+    api.abort(403, "Unauthorized action")
+
+
 @api.route('/')
 class ReviewList(Resource):
-    @api.doc('list_reviews')
+    @conditional(lambda: collection_etag('reviews'))
+    @streamed(lambda: None if is_paginated() else facade.iter_reviews(),
+              partial(marshal, fields=review_output_model))
+    @api.doc('list_reviews', params=PAGINATION_PARAMS)
     @api.marshal_list_with(review_output_model)
     def get(self):
-        reviews = facade.get_all_reviews()
-        return reviews, 200
+        reviews, headers = paginate(api, facade.get_reviews_page)
+        return reviews, 200, headers
 
     @jwt_required()
     @api.expect(review_model, validate=True)
@@ -44,40 +65,40 @@ class ReviewList(Resource):
         current_user = get_jwt_identity()
 
         review_data = api.payload
-        place = facade.get_place(review_data['place_id'])
-        if not place:
-            api.abort(404, f"Place with ID {review_data['place_id']} not found")
-
-        place_owner_id = getattr(place, 'owner_id', None)
-        if not place_owner_id and getattr(place, 'owner', None):
-            place_owner_id = getattr(place.owner, 'id', None)
-
-        if not is_admin and place_owner_id == current_user:
-            api.abort(400, "You cannot review your own place.")
-
-        existing_reviews = facade.get_reviews_by_place(review_data['place_id'])
-        for r in existing_reviews:
-            review_user_id = getattr(r, 'user_id', None)
-            if not review_user_id and getattr(r, 'user', None):
-                review_user_id = getattr(r.user, 'id', None)
-            if review_user_id == current_user:
-                api.abort(400, "You have already reviewed this place.")
-
         review_data['user_id'] = current_user
 
-        new_review = facade.create_review(review_data)
-        if not new_review:
-            api.abort(400, 'Failed to create review')
+        try:
+            new_review = facade.create_review(review_data, is_admin)
+        except LookupError as e:
+            api.abort(404, str(e))
+        except ValueError as e:
+            api.abort(400, str(e))
 
         return new_review, 201
 
 
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @jwt_required()
+    @api.doc('create_reviews_bulk', description=f'Create up to {MAX_BULK_ITEMS} reviews in one transaction')
+    @api.expect([review_model])
+    @api.response(201, 'Some or all reviews created', bulk_result_model)
+    def post(self):
+        claims = get_jwt()
+        valid, errors = validate_items(api, review_model)
+        results = facade.create_reviews(
+            [item for _, item in valid], get_jwt_identity(), claims.get('is_admin', False)
+        )
+        return bulk_response(valid, results, errors)
+
+
 @api.route('/<string:review_id>')
 class ReviewDetail(Resource):
+    @conditional(lambda review_id: entity_etag(facade.get_review(review_id, cached=False)))
     @api.doc('get_review')
     @api.marshal_with(review_output_model)
     def get(self, review_id):
-        review = facade.get_review(review_id)
+        review = facade.get_review(review_id, cached=False)
         if not review:
             api.abort(404, f"Review {review_id} not found")
         return review, 200
@@ -86,59 +107,37 @@ class ReviewDetail(Resource):
     @api.expect(review_update_model, validate=True)
     @api.marshal_with(review_output_model)
     def put(self, review_id):
-        review = facade.get_review(review_id)
-        if not review:
-            api.abort(404, f"Review {review_id} not found")
-
         claims = get_jwt()
         is_admin = claims.get('is_admin', False)
-        current_user = get_jwt_identity()
-
-        review_user_id = getattr(review, 'user_id', None)
-        if not review_user_id and getattr(review, 'user', None):
-            review_user_id = getattr(review.user, 'id', None)
-
-        if not is_admin and review_user_id != current_user:
-            api.abort(403, "Unauthorized action")
 
-        updated_review = facade.update_review(review_id, api.payload)
+        # The ownership check is part of the UPDATE; look the review up only on failure
+        owner_id = None if is_admin else get_jwt_identity()
+        updated_review = facade.update_review(review_id, api.payload, owner_id)
         if not updated_review:
-            api.abort(400, 'Failed to update review')
+            abort_missing_or_forbidden(review_id)
 
         return updated_review, 200
 
     @jwt_required()
     @api.doc('delete_review')
     def delete(self, review_id):
-        review = facade.get_review(review_id)
-        if not review:
-            api.abort(404, f"Review {review_id} not found")
-
         claims = get_jwt()
         is_admin = claims.get('is_admin', False)
-        current_user = get_jwt_identity()
-
-        review_user_id = getattr(review, 'user_id', None)
-        if not review_user_id and getattr(review, 'user', None):
-            review_user_id = getattr(review.user, 'id', None)
-
-        if not is_admin and review_user_id != current_user:
-            api.abort(403, "Unauthorized action")
 
-        success = facade.delete_review(review_id)
-        if not success:
-            api.abort(400, 'Failed to delete review')
+        owner_id = None if is_admin else get_jwt_identity()
+        if not facade.delete_review(review_id, owner_id):
+            abort_missing_or_forbidden(review_id)
 
         return {'message': 'Review deleted successfully'}, 200
 
 
 @api.route('/places/<string:place_id>')
 class PlaceReviews(Resource):
+    @conditional(lambda place_id: collection_etag('reviews'))
     @api.doc('get_place_reviews')
     @api.marshal_list_with(review_output_model)
     def get(self, place_id):
-        place = facade.get_place(place_id)
-        if not place:
+        if not facade.place_exists(id=place_id):
             api.abort(404, f"Place {place_id} not found")
 
         reviews = facade.get_reviews_by_place(place_id)
@@ -0,0 +1,80 @@
+import json
+from functools import wraps
+
+from flask import Response, request, stream_with_context
+
+JSON = 'application/json'
+NDJSON = 'application/x-ndjson'
+
+# Encoded items are sent in chunks of about this many characters
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def wants_ndjson():
+    """Whether the Accept header prefers one JSON document per line."""
+    return request.accept_mimetypes.best_match([JSON, NDJSON]) == NDJSON
+
+
+def _chunks(pieces):
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _json_array(items):
+    separator = '['
+    for item in items:
+        yield separator
+        yield json.dumps(item)
+        separator = ','
+    yield '[]\n' if separator == '[' else ']\n'
+
+
+def _ndjson(items):
+    for item in items:
+        yield json.dumps(item)
+        yield '\n'
+
+
+def stream_list(batches, serialize):
+    """
+    Response that encodes a list while it is read from the database.
+
+    batches is an iterable of lists of items (see iter_batches), consumed
+    only as the response is sent; serialize turns one item into a JSON-able
+    dict. The body is a JSON array, or NDJSON when the client asks for it,
+    so memory per request stays at one batch however long the list is.
+    """
+    items = (serialize(item) for batch in batches for item in batch)
+    if wants_ndjson():
+        body, mimetype = _ndjson(items), NDJSON
+    else:
+        body, mimetype = _json_array(items), JSON
+    # The request context (and its database session) lives until the body is sent
+    return Response(stream_with_context(_chunks(body)), mimetype=mimetype, headers={'Vary': 'Accept'})
+
+
+def streamed(get_batches, serialize):
+    """
+    Stream a list resource method's response with stream_list.
+
+    get_batches(**view_args) returns the batches to stream, or None to let
+    the method handle the request (e.g. a paginated one). It runs before
+    the response starts, so it can still reject the request with an error.
+    Must be applied outside the marshalling decorators.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            batches = get_batches(**kwargs)
+            if batches is None:
+                return method(self, *args, **kwargs)
+            return stream_list(batches, serialize)
+        return wrapper
+    return decorator
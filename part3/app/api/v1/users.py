@@ -1,6 +1,12 @@
-from flask_restx import Namespace, Resource, fields
+from functools import partial
+
+from flask_restx import Namespace, Resource, fields, marshal
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services.facade import facade
+from app.api.v1.pagination import PAGINATION_PARAMS, is_paginated, paginate
+from app.api.v1.streaming import streamed
+from app.api.v1.etags import conditional, collection_etag, entity_etag
+from app.api.v1.bulk import MAX_BULK_USERS, bulk_response, validate_items
 
 api = Namespace('users', description='User operations')
 
@@ -34,14 +40,22 @@ user_created_model = api.model('UserCreated', {
     'message': fields.String(description='Success message')
 })
 
+bulk_result_model = api.model('UserBulkResult', {
+    'created': fields.List(fields.Raw, description='[{index, id}] of the created items'),
+    'errors': fields.List(fields.Raw, description='[{index, errors}] of the rejected items')
+})
+
 
 @api.route('/')
 class UserList(Resource):
-    @api.doc('list_users')
+    @conditional(lambda: collection_etag('users'))
+    @streamed(lambda: None if is_paginated() else facade.iter_users(),
+              partial(marshal, fields=user_output_model))
+    @api.doc('list_users', params=PAGINATION_PARAMS)
     @api.marshal_list_with(user_output_model)
     def get(self):
-        users = facade.get_all_users()
-        return users, 200
+        users, headers = paginate(api, facade.get_users_page)
+        return users, 200, headers
 
     @jwt_required(optional=True)
     @api.expect(user_model, validate=True)
@@ -52,28 +66,45 @@ class UserList(Resource):
         - If there are no users yet, allow creation without token (to create first admin).
         - After first user exists, only admins can create users.
         """
-        users = facade.get_all_users()
         claims = get_jwt()
         is_admin = claims.get('is_admin', False) if claims else False
 
-        if len(users) > 0 and not is_admin:
+        if not is_admin and facade.user_exists():
             api.abort(403, "Admin privileges required")
 
         user_data = api.payload
-        existing_user = facade.get_user_by_email(user_data['email'])
-        if existing_user:
+        if facade.user_exists(email=user_data['email']):
             api.abort(400, 'Email already registered')
 
         new_user = facade.create_user(user_data)
         return {"id": new_user.id, "message": "User created successfully"}, 201
 
 
+@api.route('/bulk')
+class UserBulk(Resource):
+    @jwt_required(optional=True)
+    @api.doc('create_users_bulk', description=f'Create up to {MAX_BULK_USERS} users in one transaction')
+    @api.expect([user_model])
+    @api.response(201, 'Some or all users created', bulk_result_model)
+    def post(self):
+        """Same bootstrap rule as POST /users/: admins only once a user exists."""
+        claims = get_jwt()
+        is_admin = claims.get('is_admin', False) if claims else False
+        if not is_admin and facade.user_exists():
+            api.abort(403, "Admin privileges required")
+
+        valid, errors = validate_items(api, user_model, MAX_BULK_USERS)
+        results = facade.create_users([item for _, item in valid])
+        return bulk_response(valid, results, errors)
+
+
 @api.route('/<string:user_id>')
 class UserDetail(Resource):
+    @conditional(lambda user_id: entity_etag(facade.get_user(user_id, cached=False)))
     @api.doc('get_user')
     @api.marshal_with(user_output_model)
     def get(self, user_id):
-        user = facade.get_user(user_id)
+        user = facade.get_user(user_id, cached=False)
         if not user:
             api.abort(404, f"User {user_id} not found")
         return user, 200
@@ -86,7 +117,7 @@ class UserDetail(Resource):
         is_admin = claims.get('is_admin', False)
         current_user = get_jwt_identity()
 
-        user = facade.get_user(user_id)
+        user = facade.get_user(user_id, cached=False)
         if not user:
             api.abort(404, f"User {user_id} not found")
 
@@ -98,9 +129,8 @@ class UserDetail(Resource):
             if 'email' in user_data or 'password' in user_data or 'is_admin' in user_data:
                 api.abort(400, "You cannot modify email or password.")
 
-        if 'email' in user_data:
-            existing_user = facade.get_user_by_email(user_data['email'])
-            if existing_user and existing_user.id != user_id:
+        if 'email' in user_data and user_data['email'] != user.email:
+            if facade.user_exists(email=user_data['email']):
                 api.abort(400, "Email already registered")
 
         if 'password' in user_data:
@@ -0,0 +1,47 @@
+import click
+
+from app.persistence import migrations, query_plans
+from app.services.facade import facade
+
+
+def register_commands(app):
+    @app.cli.command("db-upgrade")
+    def db_upgrade():
+        """Create missing tables and apply pending schema migrations."""
+        applied = migrations.upgrade()
+        for migration_id in applied:
+            click.echo(f"Applied {migration_id}")
+        click.echo(f"{len(applied)} migrations applied" if applied else "Database is up to date")
+
+    @app.cli.command("backfill-geo-cells")
+    def backfill_geo_cells():
+        """Compute places.geo_cell for places created before the spatial index."""
+        count = facade.backfill_geo_cells()
+        click.echo(f"Updated geo_cell for {count} places")
+
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search_index():
+        """Re-read every place into the full-text index (run after VACUUM)."""
+        facade.rebuild_search_index()
+        click.echo("Rebuilt the place search index")
+
+    @app.cli.command("rebuild-rating-stats")
+    def rebuild_rating_stats():
+        """Recompute the per-place rating aggregates from the reviews table."""
+        count = facade.rebuild_rating_stats()
+        click.echo(f"Rebuilt rating stats from reviews of {count} places")
+
+    @app.cli.command("check-query-plans")
+    @click.option("--verbose", is_flag=True, help="Print the plan of every statement.")
+    def check_query_plans(verbose):
+        """Fail if a repository query reads a whole table instead of an index."""
+        failures = 0
+        for name, statement, plan, scans in query_plans.check_query_plans():
+            if scans or verbose:
+                click.echo(f"{'FULL SCAN' if scans else 'ok'}  {name}: {' '.join(statement.split())}")
+                for line in plan:
+                    click.echo(f"    {line}")
+            failures += bool(scans)
+        if failures:
+            raise click.ClickException(f"{failures} statements read a whole table")
+        click.echo("No full table scans")
@@ -3,5 +3,6 @@ from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
+from app.models.collection_version import CollectionVersion
 
-__all__ = ['BaseModel', 'User', 'Place', 'Review', 'Amenity']
+__all__ = ['BaseModel', 'User', 'Place', 'Review', 'Amenity', 'CollectionVersion']
@@ -12,5 +12,4 @@ class Amenity(BaseModel):
         "Place",
         secondary=place_amenity,
         back_populates="amenities",
-        lazy="subquery",
     )
@@ -0,0 +1,9 @@
+from app.models.base_model import db
+
+
+class CollectionVersion(db.Model):
+    """Write counter of one collection ("users", "places", ...), used for list ETags."""
+    __tablename__ = "collection_versions"
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
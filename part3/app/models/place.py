@@ -1,9 +1,13 @@
+from sqlalchemy import DDL, event
+
 from app.models.base_model import BaseModel, db
 
 place_amenity = db.Table(
     "place_amenity",
     db.Column("place_id", db.String(60), db.ForeignKey("places.id"), primary_key=True),
     db.Column("amenity_id", db.String(60), db.ForeignKey("amenities.id"), primary_key=True),
+    # The primary key only serves lookups by place; this one serves per-amenity counts
+    db.Index("ix_place_amenity_amenity_id", "amenity_id"),
 )
 
 
@@ -12,12 +16,25 @@ class Place(BaseModel):
 
     title = db.Column(db.String(128), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    price = db.Column(db.Float, nullable=False)
+    price = db.Column(db.Float, nullable=False, index=True)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    # Spatial grid cell of (latitude, longitude), see app.persistence.geo
+    geo_cell = db.Column(db.Integer, index=True)
+
+    # Rating aggregates of the place's reviews, kept up to date by the facade
+    # on every review write (rating_avg is 0 while there are no reviews)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_avg = db.Column(db.Float, nullable=False, default=0, index=True)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
 
     # User -> Place (one-to-many)
-    owner_id = db.Column(db.String(60), db.ForeignKey("users.id"), nullable=False)
+    owner_id = db.Column(db.String(60), db.ForeignKey("users.id"), nullable=False, index=True)
     owner = db.relationship("User", back_populates="places")
 
     # Place -> Review (one-to-many)
@@ -28,5 +45,40 @@ class Place(BaseModel):
         "Amenity",
         secondary=place_amenity,
         back_populates="places",
-        lazy="subquery",
     )
+
+
+# Full-text index of title and description (SQLite FTS5). It reads the
+# text from places itself (external content) and the triggers keep it in
+# sync with every insert, update and delete, including bulk and set-based
+# ones. Places have no INTEGER PRIMARY KEY, so VACUUM may renumber their
+# rowids: run "flask rebuild-search-index" after one.
+PLACES_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5("
+    "title, description, content='places', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS places_fts_insert AFTER INSERT ON places BEGIN "
+    "INSERT INTO places_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS places_fts_delete AFTER DELETE ON places BEGIN "
+    "INSERT INTO places_fts (places_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS places_fts_update AFTER UPDATE OF title, description ON places BEGIN "
+    "INSERT INTO places_fts (places_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO places_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+]
+
+
+def fts5_available(ddl, target, bind, **kwargs):
+    """Whether bind is a SQLite connection built with FTS5."""
+    if bind.dialect.name != "sqlite":
+        return False
+    return "ENABLE_FTS5" in {row[0] for row in bind.exec_driver_sql("PRAGMA compile_options")}
+
+
+for statement in PLACES_FTS_DDL:
+    event.listen(Place.__table__, "after_create", DDL(statement).execute_if(callable_=fts5_available))
+event.listen(Place.__table__, "before_drop",
+             DDL("DROP TABLE IF EXISTS places_fts").execute_if(callable_=fts5_available))
@@ -3,12 +3,14 @@ from app.models.base_model import BaseModel, db
 
 class Review(BaseModel):
     __tablename__ = "reviews"
+    # One review per user and place; also serves lookups by user_id
+    __table_args__ = (db.UniqueConstraint("user_id", "place_id", name="uq_reviews_user_id_place_id"),)
 
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
 
     # Review -> Place (many-to-one)
-    place_id = db.Column(db.String(60), db.ForeignKey("places.id"), nullable=False)
+    place_id = db.Column(db.String(60), db.ForeignKey("places.id"), nullable=False, index=True)
     place = db.relationship("Place", back_populates="reviews")
 
     # Review -> User (many-to-one)
@@ -1,5 +1,5 @@
-from flask_bcrypt import generate_password_hash, check_password_hash
 from app.models.base_model import BaseModel, db
+from app.passwords import password_hasher
 
 
 class User(BaseModel):
@@ -16,7 +16,7 @@ class User(BaseModel):
     reviews = db.relationship("Review", back_populates="user", cascade="all, delete-orphan", lazy=True)
 
     def hash_password(self, password):
-        self.password = generate_password_hash(password).decode("utf-8")
+        self.password = password_hasher.hash(password)
 
     def verify_password(self, password):
-        return check_password_hash(self.password, password)
+        return password_hasher.verify(password, self.password)
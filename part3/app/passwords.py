@@ -0,0 +1,130 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashes are queued, or one did not finish in time."""
+
+
+def _hash(password, log_rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(log_rounds)).decode("utf-8")
+
+
+def _verify(password, hashed):
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification in a pool of worker processes.
+
+    At most max_pending hashes may be queued or running at once; callers
+    beyond that, or whose hash takes longer than timeout seconds, get
+    PasswordHasherBusy instead of tying up their thread. With workers=0
+    hashing runs inline on the calling thread.
+    """
+
+    def __init__(self, log_rounds=12, workers=0, max_pending=64, timeout=10.0):
+        self._lock = threading.Lock()
+        self._pool = None
+        self.configure(log_rounds, workers, max_pending, timeout)
+
+    def configure(self, log_rounds=None, workers=None, max_pending=None, timeout=None):
+        with self._lock:
+            if log_rounds is not None:
+                self.log_rounds = log_rounds
+            if workers is not None:
+                self.workers = workers
+            if max_pending is not None:
+                self.max_pending = max_pending
+            if timeout is not None:
+                self.timeout = timeout
+            self._slots = threading.BoundedSemaphore(self.max_pending)
+            self._shutdown()
+
+    def _shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _submit(self, function, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Too many password hashes pending")
+        try:
+            future = self._executor().submit(function, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy("Password hashing timed out")
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next call
+            with self._lock:
+                self._shutdown()
+            raise
+
+    def _run(self, function, *args):
+        if not self.workers:
+            return function(*args)
+        return self._result(self._submit(function, *args))
+
+    def hash(self, password):
+        return self._run(_hash, password, self.log_rounds)
+
+    def hash_many(self, passwords):
+        """
+        Hash several passwords in parallel, returning the hashes in order.
+
+        Passwords go to the pool in waves of one per worker, so a batch
+        keeps every worker busy without taking all the pending slots
+        that other requests (logins) need.
+        """
+        if not self.workers:
+            return [_hash(password, self.log_rounds) for password in passwords]
+        wave = max(1, min(self.workers, self.max_pending))
+        hashes = []
+        for start in range(0, len(passwords), wave):
+            futures = []
+            try:
+                for password in passwords[start:start + wave]:
+                    futures.append(self._submit(_hash, password, self.log_rounds))
+                hashes.extend(self._result(future) for future in futures)
+            finally:
+                for future in futures:
+                    future.cancel()
+        return hashes
+
+    def verify(self, password, hashed):
+        return self._run(_verify, password, hashed)
+
+    def needs_rehash(self, hashed):
+        """
+        Whether hashed was made with a lower work factor than the configured one.
+
+        Stronger hashes are kept, so lowering the setting (e.g. in
+        development) never downgrades stored passwords.
+        """
+        try:
+            return int(hashed.split("$")[2]) < self.log_rounds
+        except (IndexError, ValueError):
+            return False
+
+
+password_hasher = PasswordHasher()
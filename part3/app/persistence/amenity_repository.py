@@ -1,7 +1,32 @@
+from sqlalchemy import func, select
+
 from app.models.amenity import Amenity
+from app.models.base_model import db
+from app.models.place import place_amenity
 from app.persistence.repository import SQLAlchemyRepository
 
 
 class AmenityRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Amenity)
+
+    def get_existing_names(self, names):
+        names = list(set(names))
+        existing = set()
+        for start in range(0, len(names), 500):
+            existing.update(db.session.scalars(
+                select(self.model.name).where(self.model.name.in_(names[start:start + 500]))
+            ))
+        return existing
+
+    def get_place_counts(self, amenity_ids):
+        """Return {amenity_id: number of linked places} from the association table."""
+        counts = dict.fromkeys(amenity_ids, 0)
+        if counts:
+            rows = db.session.execute(
+                select(place_amenity.c.amenity_id, func.count())
+                .where(place_amenity.c.amenity_id.in_(list(counts)))
+                .group_by(place_amenity.c.amenity_id)
+            )
+            counts.update(rows.tuples().all())
+        return counts
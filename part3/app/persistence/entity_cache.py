@@ -0,0 +1,130 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class EntityCache:
+    """
+    Bounded LRU cache of entity column values, keyed by primary key.
+
+    Entries expire ttl seconds after they were stored, and the least
+    recently used ones are evicted once the cache holds more than
+    max_entries entries or (approximately) max_bytes bytes. Values are
+    plain dicts of column values, never ORM instances, so one request's
+    session never sees another request's objects.
+
+    A read that started before an invalidation may not store what it
+    read: put() takes the generation returned by generation() before the
+    database read and drops the values if anything was invalidated since.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=16 * 1024 * 1024, ttl=60.0, enabled=True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, size, values)
+        self._bytes = 0
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def configure(self, max_entries=None, max_bytes=None, ttl=None, enabled=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if ttl is not None:
+                self.ttl = ttl
+            if enabled is not None:
+                self.enabled = enabled
+            self._clear()
+            self._evict()
+
+    @staticmethod
+    def _size(values):
+        return sys.getsizeof(values) + sum(
+            sys.getsizeof(key) + sys.getsizeof(value) for key, value in values.items()
+        )
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _clear(self):
+        self._entries.clear()
+        self._bytes = 0
+        self._generation += 1
+
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        """Return the cached values of key, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, values, generation):
+        if not self.enabled:
+            return
+        size = self._size(values)
+        with self._lock:
+            if generation != self._generation or size > self.max_bytes:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, values)
+            self._bytes += size
+            self._evict()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += 1
+            self._clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,133 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+# The globe is cut into a fixed grid of GRID_CELL_DEGREES x GRID_CELL_DEGREES
+# cells; each place stores the number of its cell in the indexed
+# places.geo_cell column, so spatial queries become "geo_cell IN (...)".
+GRID_CELL_DEGREES = 0.25
+GRID_ROWS = int(180 / GRID_CELL_DEGREES)
+GRID_COLUMNS = int(360 / GRID_CELL_DEGREES)
+
+# Above this many cells an IN list stops paying off; queries fall back to
+# plain latitude/longitude range predicates.
+MAX_QUERY_CELLS = 400
+
+
+def _row(latitude):
+    return min(GRID_ROWS - 1, max(0, int(math.floor((latitude + 90) / GRID_CELL_DEGREES))))
+
+
+def _column(longitude):
+    return int(math.floor((longitude + 180) / GRID_CELL_DEGREES)) % GRID_COLUMNS
+
+
+def geo_cell(latitude, longitude):
+    """Return the grid cell number containing a coordinate."""
+    return _row(latitude) * GRID_COLUMNS + _column(longitude)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two coordinates in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bbox_around(latitude, longitude, radius_km):
+    """
+    Return the (min_lat, min_lon, max_lat, max_lon) box enclosing a circle.
+
+    min_lon > max_lon means the box wraps across the antimeridian.
+    Near a pole the box spans every longitude.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    # Widest longitude span of the circle (reached at the tangent latitude)
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return min_lat, -180.0, max_lat, 180.0
+    d_lon = math.degrees(math.asin(ratio))
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def longitude_ranges(min_lon, max_lon):
+    """Split a possibly wrapping longitude range into plain [low, high] ranges."""
+    if min_lon <= max_lon:
+        return [(min_lon, max_lon)]
+    return [(min_lon, 180.0), (-180.0, max_lon)]
+
+
+def cells_in_bbox(min_lat, min_lon, max_lat, max_lon):
+    """
+    Return the grid cells overlapping a box, or None if there are too many.
+
+    Args:
+        min_lon > max_lon denotes a box wrapping across the antimeridian
+    """
+    rows = range(_row(min_lat), _row(max_lat) + 1)
+    columns = []
+    for low, high in longitude_ranges(min_lon, max_lon):
+        first, last = _column(low), _column(high)
+        if high >= 180:
+            last = GRID_COLUMNS - 1
+        columns.extend(range(first, last + 1))
+
+    if len(rows) * len(columns) > MAX_QUERY_CELLS:
+        return None
+    return [row * GRID_COLUMNS + column for row in rows for column in columns]
+
+
+def grid_square(latitude, longitude, radius_cells):
+    """
+    Return the box covering the cells at most radius_cells away from a point.
+
+    Returns:
+        (min_lat, min_lon, max_lat, max_lon, covers_globe)
+    """
+    row, column = _row(latitude), _column(longitude)
+    min_lat = max(-90.0, (row - radius_cells) * GRID_CELL_DEGREES - 90)
+    max_lat = min(90.0, (row + radius_cells + 1) * GRID_CELL_DEGREES - 90)
+
+    if 2 * radius_cells + 1 >= GRID_COLUMNS:
+        min_lon, max_lon = -180.0, 180.0
+    else:
+        min_lon = (column - radius_cells) * GRID_CELL_DEGREES - 180
+        max_lon = (column + radius_cells + 1) * GRID_CELL_DEGREES - 180
+        if min_lon < -180:
+            min_lon += 360
+        if max_lon > 180:
+            max_lon -= 360
+
+    covers_globe = (min_lat <= -90 and max_lat >= 90
+                    and min_lon == -180.0 and max_lon == 180.0)
+    return min_lat, min_lon, max_lat, max_lon, covers_globe
+
+
+def distance_to_outside_km(latitude, longitude, min_lat, min_lon, max_lat, max_lon):
+    """
+    Lower bound of the distance from a point inside a box to any point outside it.
+    """
+    bounds = []
+    if min_lat > -90:
+        bounds.append(math.radians(latitude - min_lat) * EARTH_RADIUS_KM)
+    if max_lat < 90:
+        bounds.append(math.radians(max_lat - latitude) * EARTH_RADIUS_KM)
+    if not (min_lon == -180.0 and max_lon == 180.0):
+        west = (longitude - min_lon) % 360
+        east = (max_lon - longitude) % 360
+        for d_lon in (west, east):
+            # Distance from the point to the great circle of that meridian
+            sine = math.cos(math.radians(latitude)) * math.sin(math.radians(min(d_lon, 90.0)))
+            bounds.append(math.asin(min(1.0, abs(sine))) * EARTH_RADIUS_KM)
+    return min(bounds) if bounds else math.inf
@@ -0,0 +1,142 @@
+"""
+Schema migrations for databases created from older models.
+
+db.create_all() only creates missing tables, never columns, indexes or
+constraints of tables that already exist. upgrade() runs create_all and
+then every migration not yet recorded in the schema_migrations table, in
+order, each in its own transaction. Migrations look at what is already
+there before changing it, so on a database freshly created from the
+current models they only get recorded.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, bindparam, inspect, select, update
+
+from app.models.base_model import db
+from app.models.place import PLACES_FTS_DDL, Place, fts5_available, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.persistence import geo, unit_of_work
+from app.persistence.place_repository import PlaceRepository
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("id", String(64), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+MIGRATIONS = []
+
+
+def migration(migration_id):
+    def register(function):
+        MIGRATIONS.append((migration_id, function))
+        return function
+    return register
+
+
+def _add_columns(connection, table, *names):
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for name in names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(connection.dialect)}"
+        if not column.nullable:
+            ddl += f" NOT NULL DEFAULT {column.default.arg}"
+        connection.exec_driver_sql(ddl)
+
+
+def _create_indexes(connection, table, *names):
+    indexes = {index.name: index for index in table.indexes}
+    for name in names:
+        indexes[name].create(connection, checkfirst=True)
+
+
+def _has_unique(connection, table, columns):
+    inspector = inspect(connection)
+    constraints = inspector.get_unique_constraints(table.name) + [
+        index for index in inspector.get_indexes(table.name) if index["unique"]
+    ]
+    return any(set(constraint["column_names"]) == set(columns) for constraint in constraints)
+
+
+@migration("0001_places_geo_cell")
+def places_geo_cell(connection):
+    places = Place.__table__
+    _add_columns(connection, places, "geo_cell")
+    _create_indexes(connection, places, "ix_places_geo_cell")
+    # Core statements: the Place model has columns later migrations add
+    rows = connection.execute(
+        select(places.c.id, places.c.latitude, places.c.longitude).where(places.c.geo_cell.is_(None))
+    ).all()
+    if rows:
+        connection.execute(
+            update(places).where(places.c.id == bindparam("place_id")).values(geo_cell=bindparam("cell")),
+            [{"place_id": place_id, "cell": geo.geo_cell(latitude, longitude)}
+             for place_id, latitude, longitude in rows]
+        )
+
+
+@migration("0002_listing_indexes")
+def listing_indexes(connection):
+    for model in (User, Place, Review, Amenity):
+        _create_indexes(connection, model.__table__, f"ix_{model.__tablename__}_created_at")
+    _create_indexes(connection, Place.__table__, "ix_places_price")
+    _create_indexes(connection, place_amenity, "ix_place_amenity_amenity_id")
+
+
+@migration("0003_places_rating_stats")
+def places_rating_stats(connection):
+    _add_columns(connection, Place.__table__, "review_count", "rating_sum", "rating_avg",
+                 *(f"rating_{rating}" for rating in range(1, 6)))
+    _create_indexes(connection, Place.__table__, "ix_places_rating_avg")
+    PlaceRepository().rebuild_rating_stats()
+
+
+@migration("0004_relationship_indexes")
+def relationship_indexes(connection):
+    _create_indexes(connection, Place.__table__, "ix_places_owner_id")
+    _create_indexes(connection, Review.__table__, "ix_reviews_place_id")
+    # SQLite cannot add a constraint to an existing table; a unique index
+    # enforces the same rule (and fails here if duplicates already exist)
+    if not _has_unique(connection, Review.__table__, ("user_id", "place_id")):
+        connection.exec_driver_sql(
+            "CREATE UNIQUE INDEX uq_reviews_user_id_place_id ON reviews (user_id, place_id)"
+        )
+
+
+@migration("0005_places_fts")
+def places_fts(connection):
+    if not fts5_available(None, Place.__table__, connection):
+        return
+    for statement in PLACES_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    PlaceRepository().rebuild_search_index()
+
+
+def applied_migrations():
+    connection = db.session.connection()
+    schema_migrations.create(connection, checkfirst=True)
+    return set(connection.scalars(select(schema_migrations.c.id)))
+
+
+def upgrade():
+    """Bring the database up to date; returns the ids of the migrations applied."""
+    db.create_all()
+    done = applied_migrations()
+    db.session.commit()
+
+    applied = []
+    for migration_id, function in MIGRATIONS:
+        if migration_id in done:
+            continue
+        with unit_of_work.transaction():
+            connection = db.session.connection()
+            function(connection)
+            connection.execute(schema_migrations.insert().values(id=migration_id, applied_at=datetime.utcnow()))
+        applied.append(migration_id)
+    return applied
@@ -1,7 +1,310 @@
+import re
+
+from sqlalchemy import Float, and_, case, column, func, inspect, literal_column, or_, select, table, text, tuple_, update
+from sqlalchemy.orm import selectinload
+
+from app.models.base_model import db
 from app.models.place import Place
-from app.persistence.repository import SQLAlchemyRepository
+from app.models.review import Review
+from app.persistence import geo
+from app.persistence.repository import SQLAlchemyRepository, decode_cursor, encode_cursor, invalidate_after_commit
+from app.persistence.unit_of_work import commit
+
+
+# sort parameter -> (leading sort columns, descending); ties fall back to (created_at, id)
+PLACE_SORT_ORDERS = {
+    'created_at': ((), False),
+    'price': ((Place.price,), False),
+    '-price': ((Place.price,), True),
+    'rating': ((Place.rating_avg,), False),
+    '-rating': ((Place.rating_avg,), True),
+}
+
+RATINGS = range(1, 6)
+
+LOAD_BATCH_SIZE = 500
+
+# Full-text search: bm25 weight of a title match relative to a description one
+SEARCH_TITLE_WEIGHT = 10.0
+MAX_SEARCH_TERMS = 16
+
+# The FTS5 table of app.models.place; its hidden column named after the
+# table is the left operand of MATCH and the first argument of bm25()
+places_fts = table("places_fts", column("rowid"))
+places_fts_column = literal_column("places_fts")
+
+
+def search_terms(text):
+    """The lowercase words of a search query (at most MAX_SEARCH_TERMS)."""
+    return re.findall(r"\w+", text.lower())[:MAX_SEARCH_TERMS]
 
 
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Place)
+        self.loader_profiles["detail"] = [
+            selectinload(self.model.reviews),
+            selectinload(self.model.amenities)
+        ]
+        self._has_search_index = {}  # engine -> bool
+
+    def _list_query(self):
+        """
+        Query for place lists that are serialized with their reviews and amenities.
+
+        The "detail" profile fetches both collections for the whole result
+        with one "WHERE place_id IN (...)" query each (per 500 places),
+        instead of one lazy load per place.
+        """
+        return self.query("detail")
+
+    def _price_query(self, min_price=None, max_price=None):
+        query = self._list_query()
+        if min_price is not None:
+            query = query.filter(self.model.price >= min_price)
+        if max_price is not None:
+            query = query.filter(self.model.price <= max_price)
+        return query
+
+    def _listing_query(self, min_price=None, max_price=None, sort=None):
+        query = self._price_query(min_price, max_price)
+        if sort is not None:
+            order_by, descending = PLACE_SORT_ORDERS[sort]
+            keys = list(order_by) + [self.model.created_at, self.model.id]
+            query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+        return query
+
+    def get_places(self, min_price=None, max_price=None, sort=None):
+        """Return places within a price range, ordered by a PLACE_SORT_ORDERS key."""
+        return self._listing_query(min_price, max_price, sort).all()
+
+    def iter_places(self, min_price=None, max_price=None, sort=None):
+        """get_places() in batches (see iter_batches), for streamed responses."""
+        # A generator, so the query binds to the session current when the
+        # response body is produced, not to the view's (already removed) one
+        yield from self.iter_batches(self._listing_query(min_price, max_price, sort))
+
+    def get_places_page(self, limit, cursor=None, min_price=None, max_price=None, sort='created_at'):
+        order_by, descending = PLACE_SORT_ORDERS[sort]
+        return self.get_page(limit, cursor, self._price_query(min_price, max_price),
+                             order_by, descending)
+
+    def backfill_geo_cells(self):
+        """Fill geo_cell for places stored before the spatial index existed."""
+        places = self.model.query.filter(self.model.geo_cell.is_(None)).all()
+        for place in places:
+            place.geo_cell = geo.geo_cell(place.latitude, place.longitude)
+        invalidate_after_commit(self.cache)
+        commit()
+        return len(places)
+
+    def _bbox_filter(self, min_lat, min_lon, max_lat, max_lon):
+        """SQL predicate for places inside a box (min_lon > max_lon wraps)."""
+        longitude = or_(*[
+            self.model.longitude.between(low, high)
+            for low, high in geo.longitude_ranges(min_lon, max_lon)
+        ])
+        condition = and_(self.model.latitude.between(min_lat, max_lat), longitude)
+
+        # Narrow down through the indexed grid cell when the box is small
+        cells = geo.cells_in_bbox(min_lat, min_lon, max_lat, max_lon)
+        if cells is not None:
+            condition = and_(self.model.geo_cell.in_(cells), condition)
+        return condition
+
+    def adjust_rating_stats(self, place_id, added=None, removed=None):
+        """
+        Apply one review's rating change to a place's aggregates.
+
+        added/removed are the new and old rating (None on create/delete).
+        place_id and removed may also be SQL expressions (e.g. scalar
+        subqueries on the review), so a review can be edited without
+        loading it first. The UPDATE is relative to the stored values, so
+        concurrent review writes do not lose each other's changes. It is
+        not committed here: the caller commits it together with the review.
+        """
+        model = self.model
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = 0
+        if added is not None:
+            sum_delta = sum_delta + added
+        if removed is not None:
+            sum_delta = sum_delta - removed
+        new_count = model.review_count + count_delta
+        new_sum = model.rating_sum + sum_delta
+
+        # rating_avg goes first: MySQL evaluates SET assignments left to
+        # right, so it must read review_count/rating_sum before they change
+        values = [(model.rating_avg, case((new_count > 0, new_sum * 1.0 / new_count), else_=0))]
+        if count_delta:
+            values.append((model.review_count, new_count))
+        if not isinstance(sum_delta, int) or sum_delta:
+            values.append((model.rating_sum, new_sum))
+        for rating in RATINGS:
+            delta = 0
+            for value, sign in ((added, 1), (removed, -1)):
+                if isinstance(value, int):
+                    delta += sign if value == rating else 0
+                elif value is not None:
+                    delta = delta + case((value == rating, sign), else_=0)
+            if not isinstance(delta, int) or delta:
+                column = getattr(model, f"rating_{rating}")
+                values.append((column, column + delta))
+
+        statement = update(model).where(model.id == place_id).ordered_values(*values)
+        # Find out which cached place to drop when the id is only known to SQL
+        returning = not isinstance(place_id, str) and db.engine.dialect.update_returning
+        if returning:
+            statement = statement.returning(model.id)
+        elif isinstance(place_id, str):
+            invalidate_after_commit(self.cache, place_id)
+        else:
+            invalidate_after_commit(self.cache)
+
+        result = db.session.execute(statement, execution_options={"synchronize_session": False})
+        if returning:
+            for updated_id in result.scalars():
+                invalidate_after_commit(self.cache, updated_id)
+
+    def rebuild_rating_stats(self):
+        """Recompute every place's rating aggregates from the reviews table."""
+        model = self.model
+        zero = {"review_count": 0, "rating_sum": 0, "rating_avg": 0}
+        zero.update({f"rating_{rating}": 0 for rating in RATINGS})
+        db.session.execute(update(model).values(**zero), execution_options={"synchronize_session": False})
+
+        rows = db.session.execute(
+            select(
+                Review.place_id,
+                func.count(),
+                func.sum(Review.rating),
+                *[func.sum(case((Review.rating == rating, 1), else_=0)) for rating in RATINGS]
+            ).group_by(Review.place_id)
+        ).all()
+        if rows:
+            stats = [
+                dict(
+                    id=place_id, review_count=count, rating_sum=total, rating_avg=total / count,
+                    **{f"rating_{rating}": histogram[rating - 1] for rating in RATINGS}
+                )
+                for place_id, count, total, *histogram in rows
+            ]
+            # Primary-key bulk UPDATE, sent as one executemany
+            db.session.execute(update(model), stats)
+        invalidate_after_commit(self.cache)
+        commit()
+        return len(rows)
+
+    def has_search_index(self):
+        """Whether the database has the places_fts full-text index."""
+        engine = db.engine
+        if engine not in self._has_search_index:
+            self._has_search_index[engine] = inspect(engine).has_table("places_fts")
+        return self._has_search_index[engine]
+
+    def rebuild_search_index(self):
+        """Re-read every place into places_fts (after a VACUUM renumbered rowids)."""
+        db.session.execute(text("INSERT INTO places_fts (places_fts) VALUES ('rebuild')"))
+        commit()
+
+    def search_page(self, query_text, limit, cursor=None, full_text=None):
+        """
+        Places whose title or description contain every word of query_text,
+        as (items, next_cursor).
+
+        With the FTS5 index (full_text=None: whenever the database has it)
+        results are ranked by bm25, best first, and paged on (score, id).
+        Without it, a LIKE scan returns them in creation order.
+        """
+        terms = search_terms(query_text)
+        if not terms:
+            return [], None
+        if full_text is None:
+            full_text = self.has_search_index()
+
+        if not full_text:
+            condition = and_(*[
+                or_(self.model.title.icontains(term, autoescape=True),
+                    self.model.description.icontains(term, autoescape=True))
+                for term in terms
+            ])
+            return self.get_page(limit, cursor, self._list_query().filter(condition))
+
+        # bm25() is lower for better matches
+        score = func.bm25(places_fts_column, SEARCH_TITLE_WEIGHT, 1.0, type_=Float)
+        keys = [score, self.model.id]
+        query = (
+            self._list_query()
+            .join(places_fts, places_fts.c.rowid == literal_column("places.rowid"))
+            .filter(places_fts_column.op("MATCH")(" ".join(f'"{term}"' for term in terms)))
+        )
+        if cursor is not None:
+            query = query.filter(tuple_(*keys) > tuple_(*decode_cursor(cursor, keys)))
+        rows = query.add_columns(score).order_by(*keys).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last, last_score = rows[-1]
+            next_cursor = encode_cursor([last_score, last.id])
+        return [place for place, _ in rows], next_cursor
+
+    def load_relations(self, places):
+        """Batch-load reviews and amenities of already fetched places."""
+        ids = [place.id for place in places]
+        for start in range(0, len(ids), LOAD_BATCH_SIZE):
+            batch = ids[start:start + LOAD_BATCH_SIZE]
+            self._list_query().filter(self.model.id.in_(batch)).all()
+        return places
+
+    def _candidate_query(self):
+        """Query for places that may be discarded, without their collections."""
+        return self.query("summary")
+
+    def _bbox_candidates(self, min_lat, min_lon, max_lat, max_lon):
+        return self._candidate_query().filter(self._bbox_filter(min_lat, min_lon, max_lat, max_lon)).all()
+
+    def get_places_in_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        return self._list_query().filter(self._bbox_filter(min_lat, min_lon, max_lat, max_lon)).all()
+
+    def get_places_within_radius(self, latitude, longitude, radius_km):
+        """Return [(place, distance_km)] within radius_km, nearest first."""
+        candidates = self._bbox_candidates(*geo.bbox_around(latitude, longitude, radius_km))
+        results = []
+        for place in candidates:
+            distance = geo.haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                results.append((place, distance))
+        results.sort(key=lambda item: item[1])
+        self.load_relations([place for place, _ in results])
+        return results
+
+    def get_nearest_places(self, latitude, longitude, k):
+        """
+        Return the k nearest [(place, distance_km)], nearest first.
+
+        Searches growing squares of grid cells around the point (doubling
+        the size each time) until the k-th candidate is provably closer
+        than anything outside the searched square.
+        """
+        radius_cells = 0
+        while True:
+            min_lat, min_lon, max_lat, max_lon, covers_globe = geo.grid_square(
+                latitude, longitude, radius_cells
+            )
+            if covers_globe:
+                candidates = self._candidate_query().all()
+            else:
+                candidates = self._bbox_candidates(min_lat, min_lon, max_lat, max_lon)
+
+            results = sorted(
+                ((place, geo.haversine_km(latitude, longitude, place.latitude, place.longitude))
+                 for place in candidates),
+                key=lambda item: item[1]
+            )[:k]
+
+            if covers_globe or (len(results) == k and results[-1][1] <= geo.distance_to_outside_km(
+                    latitude, longitude, min_lat, min_lon, max_lat, max_lon)):
+                self.load_relations([place for place, _ in results])
+                return results
+            radius_cells = radius_cells * 2 if radius_cells else 1
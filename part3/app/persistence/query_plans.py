@@ -0,0 +1,162 @@
+"""
+Query plan check: runs the filtered and ordered repository queries
+against the configured (SQLite) database and reports every statement
+whose EXPLAIN QUERY PLAN reads a table without an index.
+
+Runs in a transaction that is always rolled back: it seeds one row per
+table so relationship loads and keyset cursors have rows to work on,
+and leaves the database unchanged.
+"""
+
+import uuid
+from contextlib import contextmanager
+from functools import partial
+
+from sqlalchemy import event
+
+from app.models.amenity import Amenity
+from app.models.base_model import db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import geo, unit_of_work
+from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.place_repository import PLACE_SORT_ORDERS, PlaceRepository
+from app.persistence.review_repository import ReviewRepository
+from app.persistence.user_repository import UserRepository
+from app.persistence.version_repository import CollectionVersionRepository
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def capture_statements(engine):
+    """Collect the (sql, parameters) of single statements executed in the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def explain(connection, statement, parameters):
+    """The detail lines of SQLite's EXPLAIN QUERY PLAN for a statement."""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan):
+    """Plan lines that read a whole table rather than searching an index."""
+    return [
+        line for line in plan
+        if line.startswith("SCAN ") and " USING " not in line
+        and "CONSTANT ROW" not in line and "VIRTUAL TABLE" not in line
+        and not line.startswith("SCAN (")
+    ]
+
+
+def _seed():
+    suffix = uuid.uuid4().hex
+    owner = User(first_name="Plan", last_name="Owner", email=f"owner-{suffix}@plans.check", password="-")
+    guest = User(first_name="Plan", last_name="Guest", email=f"guest-{suffix}@plans.check", password="-")
+    amenity = Amenity(name=f"plans-check-{suffix}")
+    places = [
+        Place(title="Plan", description="-", price=10.0 + i, latitude=1.0, longitude=1.0,
+              geo_cell=geo.geo_cell(1.0, 1.0), owner=owner, amenities=[amenity])
+        for i in range(2)
+    ]
+    reviews = [Review(text="-", rating=4, place=place, user=guest) for place in places]
+    db.session.add_all([owner, guest, amenity, *places, *reviews])
+    db.session.flush()
+    ids = {"owner": owner.id, "guest": guest.id, "amenity": amenity.id, "place": places[0].id,
+           "review": reviews[0].id, "email": owner.email, "name": amenity.name}
+    db.session.expunge_all()
+    return ids
+
+
+def _checks(ids):
+    """(name, callable) pairs, each running one repository query path."""
+    users, places, reviews = UserRepository(), PlaceRepository(), ReviewRepository()
+    amenities, versions = AmenityRepository(), CollectionVersionRepository()
+
+    def page(get_page):
+        _, cursor = get_page(1)
+        get_page(1, cursor)
+
+    def places_page(sort):
+        _, cursor = places.get_places_page(1, None, 1, 1000, sort)
+        places.get_places_page(1, cursor, 1, 1000, sort)
+
+    checks = [
+        ("users.get", lambda: users.get(ids["owner"])),
+        ("users.get_many", lambda: users.get_many([ids["owner"], ids["guest"]])),
+        ("users.get_user_by_email", lambda: users.get_user_by_email(ids["email"])),
+        ("users.get_existing_emails", lambda: users.get_existing_emails([ids["email"]])),
+        ("users.exists email", lambda: users.exists(email=ids["email"])),
+        ("users.get_page", lambda: page(users.get_page)),
+        ("User.places", lambda: db.session.get(User, ids["owner"]).places),
+        ("User.reviews", lambda: db.session.get(User, ids["guest"]).reviews),
+        ("places.get detail", lambda: places.get(ids["place"], "detail")),
+        ("places.get_places", lambda: places.get_places(1, 1000, "price")),
+        ("places.get_places_in_bbox", lambda: places.get_places_in_bbox(0, 0, 2, 2)),
+        ("places.get_places_within_radius", lambda: places.get_places_within_radius(1, 1, 50)),
+        ("places.get_nearest_places", lambda: places.get_nearest_places(1, 1, 1)),
+        ("Place.reviews", lambda: db.session.get(Place, ids["place"]).reviews),
+        ("Place.amenities", lambda: db.session.get(Place, ids["place"]).amenities),
+        ("reviews.get_reviews_by_place", lambda: reviews.get_reviews_by_place(ids["place"])),
+        ("reviews.count place_id", lambda: reviews.count(place_id=ids["place"])),
+        ("reviews.get_reviewed_place_ids",
+         lambda: reviews.get_reviewed_place_ids(ids["guest"], [ids["place"]])),
+        ("reviews.get_page", lambda: page(reviews.get_page)),
+        ("amenities.get_existing_names", lambda: amenities.get_existing_names([ids["name"]])),
+        ("amenities.get_place_counts", lambda: amenities.get_place_counts([ids["amenity"]])),
+        ("Amenity.places", lambda: db.session.get(Amenity, ids["amenity"]).places),
+        ("versions.get_versions", lambda: versions.get_versions("places", "reviews")),
+        ("review update", lambda: (
+            places.adjust_rating_stats(
+                reviews.column_of(ids["review"], "place_id", user_id=ids["guest"]),
+                added=5,
+                removed=reviews.column_of(ids["review"], "rating", user_id=ids["guest"])
+            ),
+            reviews.update_by_id(ids["review"], {"rating": 5}, returning=True, user_id=ids["guest"])
+        )),
+        ("review delete", lambda: reviews.delete_by_id(ids["review"], user_id=ids["guest"])),
+    ]
+    if places.has_search_index():
+        checks.append(("places.search_page", lambda: page(partial(places.search_page, "plan"))))
+    checks += [(f"places.get_places_page sort={sort}", lambda sort=sort: places_page(sort))
+               for sort in PLACE_SORT_ORDERS]
+    return checks
+
+
+def check_query_plans():
+    """
+    Run every check and return [(check name, sql, plan, full scans)], one
+    entry per statement executed.
+    """
+    if db.engine.dialect.name != "sqlite":
+        raise RuntimeError("The query plan check reads SQLite's EXPLAIN QUERY PLAN")
+
+    results = []
+    try:
+        with unit_of_work.transaction():
+            connection = db.session.connection()
+            for name, check in _checks(_seed()):
+                with capture_statements(db.engine) as statements:
+                    check()
+                for statement, parameters in statements:
+                    plan = explain(connection, statement, parameters)
+                    results.append((name, statement, plan, full_scans(plan)))
+                db.session.expunge_all()
+            raise _Rollback()
+    except _Rollback:
+        pass
+    return results
@@ -1,30 +1,120 @@
+import base64
+import json
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import delete, event, func, inspect, select, tuple_, update
+from sqlalchemy.orm import Session, lazyload, make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
 from app.models.base_model import db
+from app.persistence.entity_cache import EntityCache
+from app.persistence.unit_of_work import commit
+
+PENDING_INVALIDATIONS = "entity_cache_invalidations"
+
+STREAM_BATCH_SIZE = 500
+
+
+def invalidate_after_commit(cache, key=None):
+    """
+    Drop key (None: every entry) from an entity cache now and again once
+    the current transaction ends, so a read racing with the write cannot
+    leave the pre-commit row behind in the cache.
+    """
+    if key is None:
+        cache.clear()
+    else:
+        cache.invalidate(key)
+    db.session.info.setdefault(PENDING_INVALIDATIONS, []).append((cache, key))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _apply_pending_invalidations(session):
+    if session.in_nested_transaction():
+        # A SAVEPOINT ended; the transaction (and its visibility) goes on
+        return
+    for cache, key in session.info.pop(PENDING_INVALIDATIONS, ()):
+        if key is None:
+            cache.clear()
+        else:
+            cache.invalidate(key)
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last row of a page as an opaque string."""
+    data = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor back into sort key values; raises ValueError if malformed."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (TypeError, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(data, list) or len(data) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    values = []
+    for value, column in zip(data, columns):
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (str, int, float))):
+            raise ValueError("Invalid cursor")
+        if value is not None and column.type.python_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError) as e:
+                raise ValueError("Invalid cursor") from e
+        values.append(value)
+    return values
 
 
 class Repository:
     """In-memory repository kept temporarily for non-migrated entities."""
     def __init__(self):
         self._storage = {}
+        # Membership version per class and cached get_all() tuples
+        self._versions = {}
+        self._snapshots = {}
+
+    def _bump_version(self, class_name):
+        self._versions[class_name] = self._versions.get(class_name, 0) + 1
+
+    def version(self, class_name):
+        return self._versions.get(class_name, 0)
 
     def add(self, obj):
         class_name = obj.__class__.__name__
         self._storage.setdefault(class_name, {})
         self._storage[class_name][obj.id] = obj
+        self._bump_version(class_name)
 
     def get(self, obj_id, class_name):
         return self._storage.get(class_name, {}).get(obj_id)
 
     def get_all(self, class_name):
-        return list(self._storage.get(class_name, {}).values())
+        """Return an immutable tuple, reused until the next add/delete."""
+        version = self._versions.get(class_name, 0)
+        cached = self._snapshots.get(class_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        objects = tuple(self._storage.get(class_name, {}).values())
+        self._snapshots[class_name] = (version, objects)
+        return objects
 
     def update(self, obj):
         class_name = obj.__class__.__name__
         if class_name in self._storage and obj.id in self._storage[class_name]:
-            self._storage[class_name][obj.id] = obj
+            if self._storage[class_name][obj.id] is not obj:
+                self._storage[class_name][obj.id] = obj
+                self._bump_version(class_name)
 
     def delete(self, obj_id, class_name):
         if class_name in self._storage and obj_id in self._storage[class_name]:
             del self._storage[class_name][obj_id]
+            self._bump_version(class_name)
 
     def find_by_attribute(self, class_name, attr_name, attr_value):
         for obj in self._storage.get(class_name, {}).values():
@@ -32,34 +122,237 @@ class Repository:
                 return obj
         return None
 
+    def _matching(self, class_name, filters):
+        return (
+            obj for obj in self._storage.get(class_name, {}).values()
+            if all(getattr(obj, name, None) == value for name, value in filters.items())
+        )
+
+    def count(self, class_name, **filters):
+        """Number of stored objects whose attributes equal the given filters."""
+        if not filters:
+            return len(self._storage.get(class_name, {}))
+        return sum(1 for _ in self._matching(class_name, filters))
+
+    def exists(self, class_name, **filters):
+        return next(self._matching(class_name, filters), None) is not None
+
 
 class SQLAlchemyRepository:
-    def __init__(self, model):
+    def __init__(self, model, cache=None):
         self.model = model
+        # Read-through cache of get(); any object with the EntityCache interface
+        self.cache = cache if cache is not None else EntityCache()
+        # Loader options per use case, chosen by the caller:
+        # "summary" loads the entity's own columns only, "detail" what its
+        # detail view shows (set by subclasses), "with-relations" every
+        # relationship. Without a profile the models' lazy defaults apply.
+        self.loader_profiles = {
+            "summary": [lazyload("*")],
+            "detail": [],
+            "with-relations": [selectinload("*")],
+        }
+
+    def loader_options(self, profile):
+        if profile is None:
+            return []
+        if profile not in self.loader_profiles:
+            raise ValueError(f"Unknown loader profile: {profile}")
+        return self.loader_profiles[profile]
+
+    def query(self, profile=None):
+        return self.model.query.options(*self.loader_options(profile))
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        commit()
+
+    def add_many(self, objs):
+        """
+        Insert many objects in one transaction.
 
-    def get(self, obj_id):
-        return db.session.get(self.model, obj_id)
+        The ids are generated client-side, so the flush sends the rows as
+        batched multi-row INSERTs instead of one statement per object.
+        """
+        db.session.add_all(objs)
+        commit()
+        return objs
 
-    def get_all(self):
-        return self.model.query.all()
+    def get(self, obj_id, profile=None, cached=True):
+        """
+        Return an entity by primary key: from the session if it is already
+        there, else from the entity cache, else from the database (and
+        store it in the cache).
+
+        The cache is per process, so with several server processes it can
+        lag behind a write made by another one for up to its TTL. Reads
+        that must see the current row (responses with an ETag, authorization
+        checks, the row about to be written) pass cached=False.
+        """
+        options = self.loader_options(profile)
+        if not cached or not self.cache.enabled or identity_key(self.model, obj_id) in db.session.identity_map:
+            return db.session.get(self.model, obj_id, options=options)
+
+        values = self.cache.get(obj_id)
+        if values is not None:
+            return self._from_cache(values)
+
+        generation = self.cache.generation()
+        obj = db.session.get(self.model, obj_id, options=options)
+        if obj is not None:
+            self.cache.put(obj_id, self._to_cache(obj), generation)
+        return obj
+
+    def _to_cache(self, obj):
+        return {attr.key: getattr(obj, attr.key) for attr in inspect(self.model).column_attrs}
+
+    def _from_cache(self, values):
+        """Attach a cached row to the session as a clean persistent object, without a query."""
+        obj = inspect(self.model).class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        db.session.add(obj)
+        return obj
+
+    def get_all(self, profile=None):
+        return self.query(profile).all()
+
+    def iter_batches(self, query=None, profile=None, batch_size=STREAM_BATCH_SIZE):
+        """
+        Yield the rows of query (default: every entity) as lists of at most
+        batch_size. Rows are fetched with yield_per, and selectin loaders
+        run once per batch, so only one batch is held in memory at a time.
+        Nothing runs until the first batch is requested.
+        """
+        if query is None:
+            query = self.query(profile)
+        rows = iter(query.yield_per(batch_size))
+        while batch := list(islice(rows, batch_size)):
+            yield batch
+
+    def get_many(self, obj_ids, profile=None):
+        """Return {id: entity} for the ids that exist, in batches of IN queries."""
+        obj_ids = list(set(obj_ids))
+        found = {}
+        for start in range(0, len(obj_ids), 500):
+            batch = obj_ids[start:start + 500]
+            for obj in self.query(profile).filter(self.model.id.in_(batch)):
+                found[obj.id] = obj
+        return found
+
+    def get_page(self, limit, cursor=None, query=None, order_by=(), descending=False, profile=None):
+        """
+        Keyset pagination: return (items, next_cursor).
+
+        Rows are ordered by order_by + (created_at, id), which is unique, so
+        each page starts right after the previous page's last row with an
+        indexed comparison instead of an OFFSET that rescans skipped rows.
+        next_cursor is None on the last page.
+        """
+        keys = list(order_by) + [self.model.created_at, self.model.id]
+        if query is None:
+            query = self.query(profile)
+
+        if cursor is not None:
+            values = decode_cursor(cursor, keys)
+            if descending:
+                query = query.filter(tuple_(*keys) < tuple_(*values))
+            else:
+                query = query.filter(tuple_(*keys) > tuple_(*values))
+
+        ordering = [key.desc() if descending else key.asc() for key in keys]
+        items = query.order_by(*ordering).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([getattr(items[-1], key.key) for key in keys])
+        return items, next_cursor
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
+        obj = self.get(obj_id, cached=False)
         if not obj:
             return None
         for key, value in data.items():
             setattr(obj, key, value)
-        db.session.commit()
+        invalidate_after_commit(self.cache, obj_id)
+        commit()
         return obj
 
+    def _where(self, statement, filters):
+        return statement.where(*[getattr(self.model, name) == value for name, value in filters.items()])
+
+    def _where_id(self, statement, obj_id, filters):
+        return self._where(statement.where(self.model.id == obj_id), filters)
+
+    def count(self, **filters):
+        """SELECT count(*) of the rows whose columns equal the given filters."""
+        return db.session.scalar(self._where(select(func.count()).select_from(self.model), filters))
+
+    def exists(self, **filters):
+        """Whether any row matches the filters; stops at the first one (SELECT EXISTS)."""
+        return db.session.scalar(select(self._where(select(self.model.id), filters).exists()))
+
+    def column_of(self, obj_id, column, **filters):
+        """Scalar subquery selecting one column of a row (and matching filters) by id."""
+        return self._where_id(select(getattr(self.model, column)), obj_id, filters).scalar_subquery()
+
+    def update_by_id(self, obj_id, data, returning=False, **filters):
+        """
+        UPDATE ... WHERE id = ? (AND each filter column = value), without
+        loading the row first. updated_at is refreshed by the column's
+        onupdate default.
+
+        Returns the number of rows updated; with returning=True, the
+        updated row as a dict of column values instead (None if no row
+        matched), read back through RETURNING where the database supports
+        it and with a follow-up SELECT elsewhere.
+        """
+        statement = self._where_id(update(self.model), obj_id, filters).values(**data)
+        use_returning = returning and db.engine.dialect.update_returning
+        if use_returning:
+            statement = statement.returning(*self.model.__table__.columns)
+
+        result = db.session.execute(statement, execution_options={"synchronize_session": False})
+        if use_returning:
+            row = result.mappings().first()
+            updated = int(row is not None)
+        else:
+            row = None
+            updated = result.rowcount
+        if updated:
+            invalidate_after_commit(self.cache, obj_id)
+        commit()
+
+        if not returning:
+            return updated
+        if row is None and updated:
+            row = db.session.execute(
+                select(*self.model.__table__.columns).where(self.model.id == obj_id)
+            ).mappings().first()
+        return dict(row) if row is not None else None
+
+    def delete_by_id(self, obj_id, **filters):
+        """
+        DELETE ... WHERE id = ? (AND each filter column = value), without
+        loading the row. ORM cascades do not run, so use it for rows that
+        nothing depends on. Returns the number of rows deleted.
+        """
+        result = db.session.execute(
+            self._where_id(delete(self.model), obj_id, filters),
+            execution_options={"synchronize_session": False}
+        )
+        if result.rowcount:
+            invalidate_after_commit(self.cache, obj_id)
+        commit()
+        return result.rowcount
+
     def delete(self, obj_id):
-        obj = self.get(obj_id)
+        obj = self.get(obj_id, cached=False)
         if not obj:
             return False
         db.session.delete(obj)
-        db.session.commit()
+        invalidate_after_commit(self.cache, obj_id)
+        commit()
         return True
@@ -1,5 +1,10 @@
+from sqlalchemy import bindparam, insert, select
+
+from app.models.base_model import db
+from app.models.place import Place
 from app.models.review import Review
 from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.unit_of_work import commit
 
 
 class ReviewRepository(SQLAlchemyRepository):
@@ -8,3 +13,33 @@ class ReviewRepository(SQLAlchemyRepository):
 
     def get_reviews_by_place(self, place_id):
         return self.model.query.filter_by(place_id=place_id).all()
+
+    def get_reviewed_place_ids(self, user_id, place_ids):
+        """Return which of place_ids the user has already reviewed."""
+        place_ids = list(set(place_ids))
+        reviewed = set()
+        for start in range(0, len(place_ids), 500):
+            reviewed.update(db.session.scalars(select(self.model.place_id).where(
+                self.model.user_id == user_id,
+                self.model.place_id.in_(place_ids[start:start + 500])
+            )))
+        return reviewed
+
+    def add_for_place(self, values, allow_owner=False):
+        """
+        Insert a review with one INSERT ... SELECT from its place's row, so
+        nothing is inserted if the place does not exist or (unless
+        allow_owner) the author owns it. Returns whether a row was inserted.
+
+        The (user_id, place_id) unique constraint and the user_id foreign
+        key raise IntegrityError for a second review or an unknown user.
+        """
+        table = self.model.__table__
+        source = select(*[
+            bindparam(f"new_{name}", value, type_=table.c[name].type) for name, value in values.items()
+        ]).where(Place.id == values["place_id"])
+        if not allow_owner:
+            source = source.where(Place.owner_id != values["user_id"])
+        result = db.session.execute(insert(table).from_select(list(values), source))
+        commit()
+        return result.rowcount == 1
@@ -0,0 +1,55 @@
+from sqlalchemy import event
+
+# Named sets of PRAGMAs run on every new SQLite connection. A config class
+# picks one with SQLITE_PROFILE and may override single values with
+# SQLITE_PRAGMAS. Order matters: busy_timeout first so that switching the
+# journal mode waits for other connections instead of failing.
+SQLITE_PROFILES = {
+    # SQLite's own defaults (rollback journal, synchronous=FULL), plus
+    # foreign key enforcement and a busy timeout
+    "default": {
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    # WAL lets readers run alongside the writer; synchronous=NORMAL is
+    # still crash safe in WAL mode (a power loss may drop the last commits)
+    "performance": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # negative: KiB, i.e. a 64 MB page cache
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+
+
+def sqlite_pragmas(config):
+    """The PRAGMAs selected by SQLITE_PROFILE and SQLITE_PRAGMAS in config."""
+    pragmas = dict(SQLITE_PROFILES[config.get("SQLITE_PROFILE", "default")])
+    pragmas.update(config.get("SQLITE_PRAGMAS") or {})
+    return pragmas
+
+
+def apply_pragmas(engine, pragmas):
+    """Run pragmas on each connection engine opens; no-op for other databases."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def read_pragmas(connection, names):
+    """Current values of the given PRAGMAs on a SQLAlchemy connection."""
+    return {
+        name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in names
+    }
@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.base_model import db
+
+TRANSACTION_DEPTH = "transaction_depth"
+COMMIT_COUNT = "commit_count"
+
+
+@event.listens_for(Session, "after_commit")
+def _count_commit(session):
+    # Also dispatched when a SAVEPOINT is released, which is not a commit
+    if session.in_nested_transaction():
+        return
+    session.info[COMMIT_COUNT] = session.info.get(COMMIT_COUNT, 0) + 1
+
+
+def enable_savepoints(engine):
+    """
+    Make SAVEPOINTs (nested transaction() blocks) work on pysqlite.
+
+    pysqlite only sends BEGIN before its first INSERT/UPDATE/DELETE, so a
+    SAVEPOINT opened before any write starts the transaction itself and its
+    RELEASE commits for good, whatever the outer block does next. As in
+    SQLAlchemy's documented workaround, the driver's own transaction
+    handling is turned off and SQLAlchemy emits BEGIN when a transaction
+    starts. No-op for other drivers.
+    """
+    if engine.dialect.driver != "pysqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def commit():
+    """
+    Commit the session, unless a transaction() is open.
+
+    Inside a transaction() the pending changes are only flushed (so
+    constraint errors still surface at the failing step) and committed
+    once, when the outermost transaction() exits.
+    """
+    if db.session.info.get(TRANSACTION_DEPTH, 0):
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def commit_count():
+    """Number of real commits made by the current session (one per request in Flask)."""
+    return db.session.info.get(COMMIT_COUNT, 0)
+
+
+@contextmanager
+def transaction():
+    """
+    Unit of work: repository writes inside the block share one commit.
+
+    The outermost block commits on success and rolls back on error. A
+    nested block runs in a SAVEPOINT, so its failure only undoes its own
+    writes if the caller handles the exception.
+    """
+    session = db.session
+    depth = session.info.get(TRANSACTION_DEPTH, 0)
+    session.info[TRANSACTION_DEPTH] = depth + 1
+    try:
+        if depth:
+            with session.begin_nested():
+                yield
+        else:
+            try:
+                yield
+                session.info[TRANSACTION_DEPTH] = 0
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+    finally:
+        session.info[TRANSACTION_DEPTH] = depth
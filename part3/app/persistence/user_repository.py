@@ -1,3 +1,6 @@
+from sqlalchemy import select
+
+from app.models.base_model import db
 from app.models.user import User
 from app.persistence.repository import SQLAlchemyRepository
 
@@ -8,3 +11,12 @@ class UserRepository(SQLAlchemyRepository):
 
     def get_user_by_email(self, email):
         return self.model.query.filter_by(email=email).first()
+
+    def get_existing_emails(self, emails):
+        emails = list(set(emails))
+        existing = set()
+        for start in range(0, len(emails), 500):
+            existing.update(db.session.scalars(
+                select(self.model.email).where(self.model.email.in_(emails[start:start + 500]))
+            ))
+        return existing
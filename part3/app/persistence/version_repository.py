@@ -0,0 +1,50 @@
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.base_model import db
+from app.models.collection_version import CollectionVersion
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+class CollectionVersionRepository:
+    def bump(self, *names):
+        """
+        Increment collection versions.
+
+        Not committed here: the caller's write commits it, so a version
+        changes exactly when the data it describes does. Where the dialect
+        supports it this is one upsert, so two requests creating the same
+        counter at once do not both try to INSERT it.
+        """
+        upsert = UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+        for name in names:
+            if upsert is not None:
+                db.session.execute(
+                    upsert(CollectionVersion)
+                    .values(name=name, version=1)
+                    .on_conflict_do_update(
+                        index_elements=[CollectionVersion.name],
+                        set_={"version": CollectionVersion.version + 1}
+                    )
+                )
+                continue
+            result = db.session.execute(
+                update(CollectionVersion)
+                .where(CollectionVersion.name == name)
+                .values(version=CollectionVersion.version + 1)
+            )
+            if result.rowcount == 0:
+                db.session.add(CollectionVersion(name=name, version=1))
+
+    def get_versions(self, *names):
+        """Return the current version of each collection (0 if never written)."""
+        versions = dict.fromkeys(names, 0)
+        rows = db.session.execute(
+            select(CollectionVersion.name, CollectionVersion.version)
+            .where(CollectionVersion.name.in_(names))
+        )
+        versions.update(rows.tuples().all())
+        return [versions[name] for name in names]
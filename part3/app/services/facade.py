@@ -1,3 +1,5 @@
+from sqlalchemy.exc import IntegrityError
+
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
@@ -6,6 +8,18 @@ from app.persistence.user_repository import UserRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.review_repository import ReviewRepository
 from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.version_repository import CollectionVersionRepository
+from app.persistence import unit_of_work
+from app.persistence.geo import geo_cell
+from app.passwords import PasswordHasherBusy, password_hasher
+
+# Columns a client may change with update_review/update_amenity; other keys are ignored
+REVIEW_UPDATABLE = ('text', 'rating')
+AMENITY_UPDATABLE = ('name',)
+
+
+def updatable(data, columns):
+    return {key: value for key, value in data.items() if key in columns}
 
 
 class HBnBFacade:
@@ -14,6 +28,43 @@ class HBnBFacade:
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
         self.amenity_repo = AmenityRepository()
+        self.version_repo = CollectionVersionRepository()
+
+    # TRANSACTIONS
+    def transaction(self):
+        """
+        Context manager grouping several facade/repository writes into one
+        commit; nested uses run in savepoints. See app.persistence.unit_of_work.
+        """
+        return unit_of_work.transaction()
+
+    def get_commit_count(self):
+        return unit_of_work.commit_count()
+
+    # ENTITY CACHES
+    def _entity_repositories(self):
+        return (self.user_repo, self.place_repo, self.review_repo, self.amenity_repo)
+
+    def configure_caches(self, config):
+        """Apply the ENTITY_CACHE_* settings to each repository's cache."""
+        disabled = set(config.get('ENTITY_CACHE_DISABLED', ()))
+        for repo in self._entity_repositories():
+            repo.cache.configure(
+                max_entries=config.get('ENTITY_CACHE_MAX_ENTRIES'),
+                max_bytes=config.get('ENTITY_CACHE_MAX_BYTES'),
+                ttl=config.get('ENTITY_CACHE_TTL'),
+                enabled=config.get('ENTITY_CACHE_ENABLED', True) and repo.model.__name__ not in disabled
+            )
+
+    def get_cache_stats(self):
+        return {repo.model.__name__: repo.cache.stats() for repo in self._entity_repositories()}
+
+    # COLLECTION VERSIONS
+    # Every write bumps the version of the collections whose serialized
+    # form it changes, in the same transaction; the API derives ETags
+    # from them. Places embed their reviews and amenities.
+    def get_collection_versions(self, *names):
+        return self.version_repo.get_versions(*names)
 
     # USER
     def create_user(self, user_data):
@@ -24,26 +75,131 @@ class HBnBFacade:
             is_admin=bool(user_data.get('is_admin', False))
         )
         new_user.hash_password(user_data['password'])
+        self.version_repo.bump('users')
         self.user_repo.add(new_user)
         return new_user
 
+    def create_users(self, users_data):
+        """
+        Create many users in one transaction.
+
+        Returns one entry per item: the new User, or an error message for
+        items that were rejected (the others are still created). The
+        passwords are hashed in parallel, before the INSERT transaction.
+        """
+        existing = self.user_repo.get_existing_emails([data['email'] for data in users_data])
+        results = []
+        passwords = []
+        for data in users_data:
+            if data['email'] in existing:
+                results.append('Email already registered')
+                continue
+            existing.add(data['email'])
+            results.append(User(
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                email=data['email'],
+                is_admin=bool(data.get('is_admin', False))
+            ))
+            passwords.append(data['password'])
+
+        users = [user for user in results if not isinstance(user, str)]
+        for user, hashed in zip(users, password_hasher.hash_many(passwords)):
+            user.password = hashed
+        self._add_many(self.user_repo, 'users', results, 'Email already registered')
+        return results
+
+    def _add_many(self, repo, collection, results, conflict, added=None):
+        """
+        Insert the new objects of results and bump the collection version.
+
+        The up-front checks can race with a concurrent request, so if the
+        batched INSERT hits a constraint the objects are retried one by one,
+        each in a SAVEPOINT, and the ones that still fail are replaced in
+        results by the conflict message. added(obj) runs in the same
+        transaction for every object that is inserted.
+        """
+        created = [obj for obj in results if not isinstance(obj, str)]
+        if not created:
+            return
+        try:
+            with self.transaction():
+                repo.add_many(created)
+                for obj in created:
+                    if added:
+                        added(obj)
+                self.version_repo.bump(collection)
+            return
+        except IntegrityError:
+            pass
+
+        with self.transaction():
+            for index, obj in enumerate(results):
+                if isinstance(obj, str):
+                    continue
+                try:
+                    with self.transaction():
+                        repo.add(obj)
+                        if added:
+                            added(obj)
+                except IntegrityError:
+                    results[index] = conflict
+            if any(not isinstance(obj, str) for obj in results):
+                self.version_repo.bump(collection)
+
+    def authenticate(self, email, password):
+        """
+        Return the user with these credentials, or None. A password stored
+        with a lower bcrypt work factor than the configured one is rehashed
+        (or left for the next login if the hashing pool is busy).
+        """
+        user = self.user_repo.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if password_hasher.needs_rehash(user.password):
+            try:
+                self.update_user(user.id, {'password': password_hasher.hash(password)})
+            except PasswordHasherBusy:
+                pass
+        return user
+
     def get_user_by_email(self, email):
         return self.user_repo.get_user_by_email(email)
 
-    def get_user(self, user_id):
-        return self.user_repo.get(user_id)
+    def get_user(self, user_id, cached=True):
+        return self.user_repo.get(user_id, cached=cached)
 
     def get_all_users(self):
         return self.user_repo.get_all()
 
+    def iter_users(self):
+        return self.user_repo.iter_batches()
+
+    def count_users(self, **filters):
+        return self.user_repo.count(**filters)
+
+    def user_exists(self, **filters):
+        return self.user_repo.exists(**filters)
+
+    def get_users_page(self, limit, cursor=None):
+        return self.user_repo.get_page(limit, cursor)
+
     def update_user(self, user_id, user_data):
+        if not self.user_repo.get(user_id, cached=False):
+            return None
+        self.version_repo.bump('users')
         return self.user_repo.update(user_id, user_data)
 
     # PLACE
     def create_place(self, place_data):
+        """Create a place, linked to the amenities listed in place_data['amenities'] (ids)."""
         owner = self.get_user(place_data['owner_id'])
         if not owner:
             return None
+        amenity_ids = place_data.get('amenities') or []
+        amenities = self.amenity_repo.get_many(amenity_ids, 'summary')
+        if len(amenities) != len(set(amenity_ids)):
+            return None
 
         new_place = Place(
             title=place_data['title'],
@@ -51,65 +207,275 @@ class HBnBFacade:
             price=place_data['price'],
             latitude=place_data['latitude'],
             longitude=place_data['longitude'],
-            owner_id=place_data['owner_id']
+            geo_cell=geo_cell(place_data['latitude'], place_data['longitude']),
+            owner_id=place_data['owner_id'],
+            amenities=list(amenities.values())
         )
-        self.place_repo.add(new_place)
+        with self.transaction():
+            self.place_repo.add(new_place)
+            self.version_repo.bump('places')
         return new_place
 
-    def get_place(self, place_id):
-        return self.place_repo.get(place_id)
+    def create_places(self, places_data, owner_id):
+        """Create many places owned by owner_id in one transaction (see create_users)."""
+        if not self.get_user(owner_id):
+            return ['Owner not found'] * len(places_data)
+        amenities = self.amenity_repo.get_many(
+            [amenity_id for data in places_data for amenity_id in data.get('amenities') or []], 'summary'
+        )
+        results = []
+        for data in places_data:
+            amenity_ids = set(data.get('amenities') or [])
+            missing = amenity_ids - amenities.keys()
+            if missing:
+                results.append(f"Amenities not found: {', '.join(sorted(missing))}")
+                continue
+            results.append(Place(
+                title=data['title'],
+                description=data['description'],
+                price=data['price'],
+                latitude=data['latitude'],
+                longitude=data['longitude'],
+                geo_cell=geo_cell(data['latitude'], data['longitude']),
+                owner_id=owner_id,
+                amenities=[amenities[amenity_id] for amenity_id in amenity_ids]
+            ))
+        self._add_many(self.place_repo, 'places', results, 'Owner not found')
+        return results
+
+    def get_place(self, place_id, profile=None, cached=True):
+        return self.place_repo.get(place_id, profile, cached)
 
     def get_all_places(self):
         return self.place_repo.get_all()
 
+    def count_places(self, **filters):
+        return self.place_repo.count(**filters)
+
+    def place_exists(self, **filters):
+        return self.place_repo.exists(**filters)
+
+    def get_places(self, min_price=None, max_price=None, sort=None):
+        return self.place_repo.get_places(min_price, max_price, sort)
+
+    def iter_places(self, min_price=None, max_price=None, sort=None):
+        return self.place_repo.iter_places(min_price, max_price, sort)
+
+    def get_places_page(self, limit, cursor=None, min_price=None, max_price=None, sort='created_at'):
+        return self.place_repo.get_places_page(limit, cursor, min_price, max_price, sort)
+
     def update_place(self, place_id, place_data):
+        place = self.place_repo.get(place_id, cached=False)
+        if not place:
+            return None
+        if 'latitude' in place_data or 'longitude' in place_data:
+            place_data = dict(place_data)
+            place_data['geo_cell'] = geo_cell(
+                place_data.get('latitude', place.latitude),
+                place_data.get('longitude', place.longitude)
+            )
+        self.version_repo.bump('places')
         return self.place_repo.update(place_id, place_data)
 
+    def search_places_page(self, query_text, limit, cursor=None):
+        return self.place_repo.search_page(query_text, limit, cursor)
+
+    def rebuild_search_index(self):
+        return self.place_repo.rebuild_search_index()
+
+    def backfill_geo_cells(self):
+        self.version_repo.bump('places')
+        return self.place_repo.backfill_geo_cells()
+
+    def get_places_in_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        return self.place_repo.get_places_in_bbox(min_lat, min_lon, max_lat, max_lon)
+
+    def get_places_within_radius(self, latitude, longitude, radius_km):
+        return self.place_repo.get_places_within_radius(latitude, longitude, radius_km)
+
+    def get_nearest_places(self, latitude, longitude, k):
+        return self.place_repo.get_nearest_places(latitude, longitude, k)
+
     # REVIEW
-    def create_review(self, review_data):
-        place = self.get_place(review_data['place_id'])
-        user = self.get_user(review_data['user_id'])
-        if not place or not user:
-            return None
+    def create_review(self, review_data, is_admin=False):
+        """
+        Create a review in one transaction: a single INSERT ... SELECT
+        checks the place and its owner, the database enforces one review
+        per user and place, then the place's rating aggregates follow.
 
+        Returns the new Review (not attached to the session). Raises
+        LookupError if the place does not exist and ValueError if the user
+        does not, owns the place (unless is_admin) or already reviewed it.
+        """
         new_review = Review(
             text=review_data['text'],
             rating=review_data['rating'],
             place_id=review_data['place_id'],
             user_id=review_data['user_id']
         )
-        self.review_repo.add(new_review)
+        values = {column.key: getattr(new_review, column.key) for column in Review.__table__.columns}
+        try:
+            with self.transaction():
+                inserted = self.review_repo.add_for_place(values, allow_owner=is_admin)
+                if inserted:
+                    self.place_repo.adjust_rating_stats(new_review.place_id, added=new_review.rating)
+                    self.version_repo.bump('reviews')
+        except IntegrityError:
+            if not self.get_user(new_review.user_id):
+                raise ValueError(f"User with ID {new_review.user_id} not found")
+            raise ValueError("You have already reviewed this place.")
+
+        if not inserted:
+            if not self.get_place(new_review.place_id, 'summary'):
+                raise LookupError(f"Place with ID {new_review.place_id} not found")
+            raise ValueError("You cannot review your own place.")
         return new_review
 
-    def get_review(self, review_id):
-        return self.review_repo.get(review_id)
+    def create_reviews(self, reviews_data, user_id, is_admin=False):
+        """
+        Create many reviews by user_id in one transaction (see create_users).
+
+        Applies the same rules as a single review: the place must exist,
+        owners cannot review their own place (unless admin) and a user
+        reviews a place at most once.
+        """
+        place_ids = [data['place_id'] for data in reviews_data]
+        places = self.place_repo.get_many(place_ids, 'summary')
+        reviewed = self.review_repo.get_reviewed_place_ids(user_id, place_ids)
+        results = []
+        for data in reviews_data:
+            place = places.get(data['place_id'])
+            if not place:
+                results.append(f"Place with ID {data['place_id']} not found")
+            elif not is_admin and place.owner_id == user_id:
+                results.append("You cannot review your own place.")
+            elif data['place_id'] in reviewed:
+                results.append("You have already reviewed this place.")
+            else:
+                reviewed.add(data['place_id'])
+                results.append(Review(
+                    text=data['text'],
+                    rating=data['rating'],
+                    place_id=data['place_id'],
+                    user_id=user_id
+                ))
+        self._add_many(
+            self.review_repo, 'reviews', results, "You have already reviewed this place.",
+            added=lambda review: self.place_repo.adjust_rating_stats(review.place_id, added=review.rating)
+        )
+        return results
+
+    def get_review(self, review_id, cached=True):
+        return self.review_repo.get(review_id, cached=cached)
 
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
+    def iter_reviews(self):
+        return self.review_repo.iter_batches()
+
+    def count_reviews(self, **filters):
+        return self.review_repo.count(**filters)
+
+    def review_exists(self, **filters):
+        return self.review_repo.exists(**filters)
+
+    def get_reviews_page(self, limit, cursor=None):
+        return self.review_repo.get_page(limit, cursor)
+
     def get_reviews_by_place(self, place_id):
         return self.review_repo.get_reviews_by_place(place_id)
 
-    def update_review(self, review_id, review_data):
-        return self.review_repo.update(review_id, review_data)
+    def update_review(self, review_id, review_data, user_id=None):
+        """
+        Update a review in place, without loading it first.
+
+        Only text and rating are changed; other keys (including place_id
+        and user_id) are ignored. With user_id, only that user's review is
+        updated. Returns the updated review as a dict of column values, or
+        None if no review matched.
+        """
+        filters = {'user_id': user_id} if user_id else {}
+        review_data = updatable(review_data, REVIEW_UPDATABLE)
+        with self.transaction():
+            if 'rating' in review_data:
+                # Moves the stored rating to the new one in SQL, before the row changes
+                self.place_repo.adjust_rating_stats(
+                    self.review_repo.column_of(review_id, 'place_id', **filters),
+                    added=review_data['rating'],
+                    removed=self.review_repo.column_of(review_id, 'rating', **filters)
+                )
+            review = self.review_repo.update_by_id(review_id, review_data, returning=True, **filters)
+            if review:
+                self.version_repo.bump('reviews')
+            return review
+
+    def delete_review(self, review_id, user_id=None):
+        """Delete a review (only user_id's, if given) without loading it; returns whether it existed."""
+        filters = {'user_id': user_id} if user_id else {}
+        with self.transaction():
+            self.place_repo.adjust_rating_stats(
+                self.review_repo.column_of(review_id, 'place_id', **filters),
+                removed=self.review_repo.column_of(review_id, 'rating', **filters)
+            )
+            deleted = self.review_repo.delete_by_id(review_id, **filters)
+            if deleted:
+                self.version_repo.bump('reviews')
+            return bool(deleted)
 
-    def delete_review(self, review_id):
-        return self.review_repo.delete(review_id)
+    def rebuild_rating_stats(self):
+        self.version_repo.bump('places')
+        return self.place_repo.rebuild_rating_stats()
 
     # AMENITY
     def create_amenity(self, amenity_data):
         new_amenity = Amenity(name=amenity_data['name'])
+        self.version_repo.bump('amenities')
         self.amenity_repo.add(new_amenity)
         return new_amenity
 
-    def get_amenity(self, amenity_id):
-        return self.amenity_repo.get(amenity_id)
+    def create_amenities(self, amenities_data):
+        """Create many amenities in one transaction (see create_users)."""
+        existing = self.amenity_repo.get_existing_names([data['name'] for data in amenities_data])
+        results = []
+        for data in amenities_data:
+            if data['name'] in existing:
+                results.append('Amenity already exists')
+                continue
+            existing.add(data['name'])
+            results.append(Amenity(name=data['name']))
+        self._add_many(self.amenity_repo, 'amenities', results, 'Amenity already exists')
+        return results
+
+    def get_amenity(self, amenity_id, profile=None, cached=True):
+        return self.amenity_repo.get(amenity_id, profile, cached)
+
+    def get_all_amenities(self, profile=None):
+        return self.amenity_repo.get_all(profile)
+
+    def iter_amenities(self, profile=None):
+        return self.amenity_repo.iter_batches(profile=profile)
+
+    def count_amenities(self, **filters):
+        return self.amenity_repo.count(**filters)
+
+    def amenity_exists(self, **filters):
+        return self.amenity_repo.exists(**filters)
+
+    def get_amenities_page(self, limit, cursor=None, profile=None):
+        return self.amenity_repo.get_page(limit, cursor, profile=profile)
 
-    def get_all_amenities(self):
-        return self.amenity_repo.get_all()
+    def get_amenity_place_counts(self, amenity_ids):
+        return self.amenity_repo.get_place_counts(amenity_ids)
 
     def update_amenity(self, amenity_id, amenity_data):
-        return self.amenity_repo.update(amenity_id, amenity_data)
+        """Update an amenity's name without loading it; returns its column values or None."""
+        amenity_data = updatable(amenity_data, AMENITY_UPDATABLE)
+        with self.transaction():
+            amenity = self.amenity_repo.update_by_id(amenity_id, amenity_data, returning=True)
+            if amenity:
+                self.version_repo.bump('amenities')
+            return amenity
 
 
 facade = HBnBFacade()
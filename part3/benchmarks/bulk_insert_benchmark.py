@@ -0,0 +1,77 @@
+"""
+Bulk insert benchmark
+Compares rows/second for creating places one by one (one commit per
+place, as the single POST endpoint does) with creating them in batches
+through HBnBFacade.create_places (one transaction, batched INSERTs), on
+a SQLite file database.
+
+Run from the part3 directory:
+    python -m benchmarks.bulk_insert_benchmark [--rows N] [--batch N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app
+from app.models.base_model import db
+from app.services.facade import facade
+from config import Config
+
+
+def place_data(i):
+    return {
+        "title": f"Place {i}",
+        "description": "Benchmark place",
+        "price": 10.0 + i % 300,
+        "latitude": (i % 180) - 90.0,
+        "longitude": (i % 360) - 180.0,
+    }
+
+
+def run(database_path, rows, batch):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        owner = facade.create_user({
+            "first_name": "Bench", "last_name": "Owner",
+            "email": "owner@bench.io", "password": "bench"
+        })
+
+        start = time.perf_counter()
+        if batch:
+            for offset in range(0, rows, batch):
+                facade.create_places(
+                    [place_data(i) for i in range(offset, min(rows, offset + batch))], owner.id
+                )
+        else:
+            for i in range(rows):
+                facade.create_place(dict(place_data(i), owner_id=owner.id))
+        elapsed = time.perf_counter() - start
+        db.session.remove()
+        db.engine.dispose()
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        single = run(os.path.join(directory, "single.db"), args.rows, None)
+        bulk = run(os.path.join(directory, "bulk.db"), args.rows, args.batch)
+
+    print(f'{"mode":<24} {"rows/s":>10}')
+    print(f'{"single (commit per row)":<24} {single:>10.0f}')
+    print(f'{f"bulk (batches of {args.batch})":<24} {bulk:>10.0f}')
+    print(f'speedup: {bulk / single:.1f}x')
+
+
+if __name__ == "__main__":
+    main()
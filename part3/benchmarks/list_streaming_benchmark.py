@@ -0,0 +1,108 @@
+"""
+List streaming benchmark
+Compares the peak memory of one GET /api/v1/places/ request for the
+whole list when it is built as one Python list and encoded in one buffer
+(the previous behaviour) and when it is streamed in batches (JSON array
+and NDJSON), at several table sizes. Memory is the peak of the Python
+heap (tracemalloc) while the response body is produced and sent.
+
+Run from the part3 directory:
+    python -m benchmarks.list_streaming_benchmark [--sizes 10000 50000]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from app.api.v1.places import serialize_place
+from app.models.base_model import db
+from app.models.place import Place
+from app.services.facade import facade
+from config import Config
+
+
+def seed(places):
+    owner = facade.create_user({
+        "first_name": "Bench", "last_name": "Owner",
+        "email": "owner@bench.io", "password": "bench"
+    })
+    now = datetime.utcnow()
+    for start in range(0, places, 10000):
+        rows = [
+            {
+                "id": str(uuid.uuid4()), "title": f"Place {i}", "description": "Benchmark place " * 8,
+                "price": 100.0, "latitude": 0.0, "longitude": 0.0, "owner_id": owner.id,
+                "created_at": now, "updated_at": now
+            }
+            for i in range(start, min(start + 10000, places))
+        ]
+        db.session.execute(Place.__table__.insert(), rows)
+    db.session.commit()
+    db.session.remove()
+
+
+def buffered(app):
+    """The previous list path: every place serialized into one list, then one dumps()."""
+    with app.test_request_context("/api/v1/places/"):
+        body = json.dumps([serialize_place(place) for place in facade.get_places()]) + "\n"
+        return len(body.encode("utf-8"))
+
+
+def streamed(app, accept):
+    """The request through the WSGI app, reading the body chunk by chunk as a server does."""
+    environ = EnvironBuilder("/api/v1/places/", headers={"Accept": accept}).get_environ()
+    body = app.wsgi_app(environ, lambda status, headers: None)
+    try:
+        return sum(len(chunk) for chunk in body)
+    finally:
+        body.close()
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, peak / 2 ** 20, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    modes = {
+        "buffered (before)": buffered,
+        "streamed JSON": lambda app: streamed(app, "application/json"),
+        "streamed NDJSON": lambda app: streamed(app, "application/x-ndjson"),
+    }
+
+    print(f'{"places":>8} {"mode":<18} {"body MB":>8} {"peak MB":>8} {"seconds":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        for places in args.sizes:
+            class BenchmarkConfig(Config):
+                SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, f'{places}.db')}"
+
+            app = create_app(BenchmarkConfig)
+            with app.app_context():
+                db.create_all()
+                seed(places)
+            for mode, function in modes.items():
+                size, peak, elapsed = measure(lambda: function(app))
+                print(f"{places:>8} {mode:<18} {size / 2 ** 20:>8.1f} {peak:>8.1f} {elapsed:>8.2f}")
+            with app.app_context():
+                db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Login throughput benchmark
+Compares POST /api/v1/auth/login requests per second with bcrypt run
+inline on the request threads (PASSWORD_HASH_WORKERS=0, the previous
+behaviour) and in the worker process pool, with several client threads
+logging in concurrently. Rejected logins (503: pool queue full or timed
+out) are counted separately.
+
+Run from the part3 directory:
+    python -m benchmarks.login_throughput_benchmark [--requests N] [--threads N] [--rounds N] [--workers N]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from app import create_app
+from app.models.base_model import db
+from app.services.facade import facade
+from config import Config
+
+
+def run(database_path, requests, threads, rounds, workers):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        BCRYPT_LOG_ROUNDS = rounds
+        PASSWORD_HASH_WORKERS = workers
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        facade.create_user({
+            "first_name": "Bench", "last_name": "User",
+            "email": "user@bench.io", "password": "bench-password"
+        })
+        db.session.remove()
+
+    statuses = []
+
+    def client(count):
+        with app.test_client() as test_client:
+            for _ in range(count):
+                response = test_client.post("/api/v1/auth/login", json={
+                    "email": "user@bench.io", "password": "bench-password"
+                })
+                statuses.append(response.status_code)
+
+    # One warm-up login starts the worker processes
+    client(1)
+    statuses.clear()
+
+    per_thread = requests // threads
+    clients = [threading.Thread(target=client, args=(per_thread,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        db.engine.dispose()
+    return statuses.count(200) / elapsed, statuses.count(503)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, bcrypt rounds {args.rounds}, {args.threads} client threads")
+    print(f'{"mode":<22} {"logins/s":>10} {"rejected":>9}')
+    with tempfile.TemporaryDirectory() as directory:
+        for label, workers in (("inline (before)", 0), (f"pool of {args.workers}", args.workers)):
+            rate, rejected = run(
+                os.path.join(directory, f"{workers}.db"), args.requests, args.threads, args.rounds, workers
+            )
+            print(f"{label:<22} {rate:>10.1f} {rejected:>9}")
+
+
+if __name__ == "__main__":
+    main()
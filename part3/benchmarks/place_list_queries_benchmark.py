@@ -0,0 +1,107 @@
+"""
+Place list query benchmark
+Counts the SQL statements and wall time of GET /api/v1/places/ for a
+catalog of places that each have reviews and amenities, next to the
+per-place lazy loading path (get_all + serialize_place).
+
+Exits with an error if the listing does not run in a fixed number of
+statements.
+
+Run from the part3 directory:
+    python -m benchmarks.place_list_queries_benchmark [--places N]
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from app.api.v1.places import serialize_place
+from app.models.amenity import Amenity
+from app.models.base_model import db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from config import Config
+
+# places, reviews and amenities, each fetched once per 500 places
+MAX_STATEMENTS_PER_500 = 3
+# collection version read for the ETag
+FIXED_STATEMENTS = 1
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+
+def populate(places, reviews_per_place=3, amenities_per_place=2):
+    owner = User(first_name="Bench", last_name="Owner", email="owner@bench.io", password="x")
+    # One user may review a place only once
+    reviewers = [
+        User(first_name="Bench", last_name=f"Reviewer {j}", email=f"reviewer{j}@bench.io", password="x")
+        for j in range(reviews_per_place)
+    ]
+    amenities = [Amenity(name=f"Amenity {i}") for i in range(10)]
+    db.session.add_all([owner, *reviewers])
+    db.session.add_all(amenities)
+    for i in range(places):
+        place = Place(title=f"Place {i}", description="Benchmark place", price=10.0 + i % 300,
+                      latitude=0.0, longitude=0.0, owner=owner)
+        place.amenities = [amenities[(i + j) % len(amenities)] for j in range(amenities_per_place)]
+        for j in range(reviews_per_place):
+            place.reviews.append(Review(text="Nice", rating=1 + j % 5, user=reviewers[j]))
+        db.session.add(place)
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def count_statements(function):
+    """Return (statements, milliseconds, result) of function() on a fresh session."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Transaction control (see unit_of_work.enable_savepoints) is not a query
+        if statement != "BEGIN":
+            statements.append(statement)
+
+    db.session.expunge_all()
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements), elapsed * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--places", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_app(BenchmarkConfig)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        populate(args.places)
+
+        lazy = count_statements(lambda: [serialize_place(place) for place in Place.query.all()])
+        # The list is streamed: its queries run while the body is read
+        listing = count_statements(lambda: client.get("/api/v1/places/", buffered=True))
+
+        print(f'{"path":<22} {"statements":>10} {"time":>10}')
+        print(f'{"lazy per place":<22} {lazy[0]:>10} {lazy[1]:>7.1f} ms')
+        print(f'{"GET /places/":<22} {listing[0]:>10} {listing[1]:>7.1f} ms')
+
+        response = listing[2]
+        assert response.status_code == 200 and len(response.json) == args.places
+        limit = FIXED_STATEMENTS + MAX_STATEMENTS_PER_500 * -(-args.places // 500)
+        if listing[0] > limit:
+            sys.exit(f"GET /places/ ran {listing[0]} statements, expected at most {limit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Place search benchmark
+Compares the latency of one page of GET /places/search results through
+the FTS5 index (PlaceRepository.search_page) with the LIKE scan it falls
+back to without the index, on a SQLite file database of N places whose
+titles and descriptions are drawn from a fixed vocabulary.
+
+Run from the part3 directory:
+    python -m benchmarks.place_search_benchmark [--places N] [--limit N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from app import create_app
+from app.models.base_model import db
+from app.models.place import Place
+from app.services.facade import facade
+from config import Config
+
+VOCABULARY_SIZE = 5000
+
+
+def word(i):
+    return f"w{i}"
+
+
+def random_text(rng, words):
+    # Zipf-like: low word numbers are common, high ones rare
+    return " ".join(word(int(rng.paretovariate(1.0)) % VOCABULARY_SIZE) for _ in range(words))
+
+
+def seed(places):
+    rng = random.Random(42)
+    owner = facade.create_user({
+        "first_name": "Bench", "last_name": "Owner",
+        "email": "owner@bench.io", "password": "bench"
+    })
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()), "title": random_text(rng, 4), "description": random_text(rng, 30),
+            "price": 100.0, "latitude": 0.0, "longitude": 0.0, "owner_id": owner.id,
+            "created_at": now, "updated_at": now
+        }
+        for _ in range(places)
+    ]
+    for start in range(0, places, 10000):
+        db.session.execute(Place.__table__.insert(), rows[start:start + 10000])
+    db.session.commit()
+
+
+def measure(query_text, limit, repeat, full_text):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items, _ = facade.place_repo.search_page(query_text, limit, full_text=full_text)
+        timings.append(time.perf_counter() - start)
+        db.session.remove()
+    return len(items), sorted(timings)[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    queries = {
+        "common word": word(1),
+        "two common words": f"{word(1)} {word(2)}",
+        "rare word": word(997),
+        "no match": "absent",
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        class BenchmarkConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'search.db')}"
+            SQLITE_PROFILE = "performance"
+
+        app = create_app(BenchmarkConfig)
+        with app.app_context():
+            db.create_all()
+            start = time.perf_counter()
+            seed(args.places)
+            print(f"{args.places} places inserted and indexed in {time.perf_counter() - start:.1f} s")
+
+            print(f'{"query":<18} {"hits":>5} {"FTS5 ms":>9} {"LIKE ms":>9} {"speedup":>8}')
+            for label, query_text in queries.items():
+                hits, fts = measure(query_text, args.limit, args.repeat, True)
+                _, like = measure(query_text, args.limit, args.repeat, False)
+                print(f"{label:<18} {hits:>5} {fts:>9.2f} {like:>9.2f} {like / fts:>7.1f}x")
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
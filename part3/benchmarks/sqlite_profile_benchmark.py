@@ -0,0 +1,115 @@
+"""
+SQLite profile benchmark
+Compares read and write throughput of the SQLite storage profiles
+(app.persistence.sqlite.SQLITE_PROFILES) on a file database:
+
+- writes: amenities created one by one, one commit each
+- reads: amenities fetched by id from several threads
+- mixed: the same readers while one thread keeps writing
+
+The entity cache is turned off so every read reaches the database.
+
+Run from the part3 directory:
+    python -m benchmarks.sqlite_profile_benchmark [--rows N] [--threads N] [--seconds S]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from app import create_app
+from app.models.base_model import db
+from app.persistence.sqlite import SQLITE_PROFILES
+from app.services.facade import facade
+from config import Config
+
+
+def make_app(database_path, profile, threads):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        SQLITE_PROFILE = profile
+        SQLALCHEMY_ENGINE_OPTIONS = {"pool_size": threads + 1, "max_overflow": 0}
+        ENTITY_CACHE_ENABLED = False
+
+    return create_app(BenchmarkConfig)
+
+
+def writer(app, stop, counts, prefix):
+    with app.app_context():
+        i = 0
+        while not stop.is_set():
+            facade.create_amenity({"name": f"{prefix}{i}"})
+            i += 1
+        counts.append(i)
+        db.session.remove()
+
+
+def reader(app, ids, stop, counts, reads=None):
+    with app.app_context():
+        done = 0
+        rng = random.Random()
+        while not stop.is_set() and (reads is None or done < reads):
+            facade.get_amenity(rng.choice(ids))
+            db.session.remove()
+            done += 1
+        counts.append(done)
+
+
+def run(database_path, profile, rows, threads, seconds):
+    app = make_app(database_path, profile, threads)
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        ids = [facade.create_amenity({"name": f"amenity {i}"}).id for i in range(rows)]
+        writes = rows / (time.perf_counter() - start)
+        db.session.remove()
+
+    stop = threading.Event()
+    counts = []
+    workers = [
+        threading.Thread(target=reader, args=(app, ids, stop, counts, rows))
+        for _ in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    reads = sum(counts) / (time.perf_counter() - start)
+
+    counts, written = [], []
+    workers = [threading.Thread(target=reader, args=(app, ids, stop, counts)) for _ in range(threads)]
+    workers.append(threading.Thread(target=writer, args=(app, stop, written, "mixed ")))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    with app.app_context():
+        db.engine.dispose()
+    return writes, reads, sum(counts) / seconds, sum(written) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f'{"profile":<12} {"writes/s":>10} {"reads/s":>10} {"mixed reads/s":>14} {"mixed writes/s":>15}')
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in SQLITE_PROFILES:
+            writes, reads, mixed_reads, mixed_writes = run(
+                os.path.join(directory, f"{profile}.db"), profile, args.rows, args.threads, args.seconds
+            )
+            print(f"{profile:<12} {writes:>10.0f} {reads:>10.0f} {mixed_reads:>14.0f} {mixed_writes:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Unit of work check
+Runs nested unit_of_work.transaction() blocks against a SQLite file
+database, once per SQLITE_PROFILE, and checks that the outer block stays
+all-or-nothing: a nested block that succeeded is still undone when the
+outer block fails, and a nested block that failed (and whose error the
+caller handled) undoes only its own writes. Exits with status 1 if a
+check fails.
+
+Run from the part3 directory:
+    python -m benchmarks.unit_of_work_check
+"""
+
+import os
+import sys
+import tempfile
+
+from app import create_app
+from app.models.amenity import Amenity
+from app.models.base_model import db
+from app.persistence import unit_of_work
+from app.persistence.sqlite import SQLITE_PROFILES
+from config import Config
+
+
+class Failure(Exception):
+    pass
+
+
+def add(name):
+    db.session.add(Amenity(name=name))
+    db.session.flush()
+
+
+def nested_succeeds_outer_fails():
+    # The SAVEPOINT is the first statement of the transaction
+    try:
+        with unit_of_work.transaction():
+            with unit_of_work.transaction():
+                add("nested")
+            add("outer")
+            raise Failure()
+    except Failure:
+        pass
+    return set()
+
+
+def nested_fails_outer_succeeds():
+    with unit_of_work.transaction():
+        try:
+            with unit_of_work.transaction():
+                add("nested")
+                raise Failure()
+        except Failure:
+            pass
+        add("outer")
+    return {"outer"}
+
+
+CHECKS = {
+    "nested succeeds, outer fails": nested_succeeds_outer_fails,
+    "nested fails, outer succeeds": nested_fails_outer_succeeds,
+}
+
+
+def main():
+    failed = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in SQLITE_PROFILES:
+            for number, (name, check) in enumerate(CHECKS.items()):
+                class CheckConfig(Config):
+                    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, f'{profile}-{number}.db')}"
+                    SQLITE_PROFILE = profile
+
+                app = create_app(CheckConfig)
+                with app.app_context():
+                    db.create_all()
+                    expected = check()
+                    db.session.remove()
+                    stored = {amenity.name for amenity in Amenity.query}
+                    db.session.remove()
+                    db.engine.dispose()
+
+                ok = stored == expected
+                failed += not ok
+                print(f"{'ok' if ok else 'FAIL':<5} {profile:<12} {name}: stored {sorted(stored)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
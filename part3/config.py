@@ -7,13 +7,46 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///development.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Read-through cache of repository get() per entity type
+    ENTITY_CACHE_ENABLED = True
+    ENTITY_CACHE_MAX_ENTRIES = 10000
+    ENTITY_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    ENTITY_CACHE_TTL = 60
+    # Model names whose cache is turned off, e.g. ("User",)
+    ENTITY_CACHE_DISABLED = ()
+
+    # PRAGMAs run on each new SQLite connection: a named profile from
+    # app.persistence.sqlite.SQLITE_PROFILES, plus per-PRAGMA overrides
+    SQLITE_PROFILE = "default"
+    SQLITE_PRAGMAS = {}
+
+    # bcrypt work factor; a login rehashes passwords stored with another one
+    BCRYPT_LOG_ROUNDS = 12
+    # Hashing runs in this many worker processes (0: on the request thread).
+    # Every server worker starts its own pool, so size it per server worker.
+    # Beyond PASSWORD_HASH_MAX_PENDING queued hashes, or after waiting
+    # PASSWORD_HASH_TIMEOUT seconds, requests get a 503
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+    PASSWORD_HASH_MAX_PENDING = 64
+    PASSWORD_HASH_TIMEOUT = 10
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    BCRYPT_LOG_ROUNDS = 10
 
 
 class ProductionConfig(Config):
     DEBUG = False
+    SQLITE_PROFILE = "performance"
+    # Connection pool for multi-threaded servers (file databases; in-memory
+    # SQLite uses a single shared connection and takes no pool options)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": 30,
+        "pool_recycle": 3600,
+    }
 
 
 config = {
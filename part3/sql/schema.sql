@@ -1,10 +1,13 @@
 PRAGMA foreign_keys = ON;
 
+DROP TABLE IF EXISTS places_fts;
 DROP TABLE IF EXISTS place_amenity;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS places;
 DROP TABLE IF EXISTS amenities;
 DROP TABLE IF EXISTS users;
+DROP TABLE IF EXISTS collection_versions;
+DROP TABLE IF EXISTS schema_migrations;
 
 CREATE TABLE users (
     id CHAR(36) PRIMARY KEY,
@@ -22,21 +25,56 @@ CREATE TABLE places (
     price DECIMAL(10, 2) NOT NULL,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
+    geo_cell INTEGER,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_avg FLOAT NOT NULL DEFAULT 0,
+    rating_1 INT NOT NULL DEFAULT 0,
+    rating_2 INT NOT NULL DEFAULT 0,
+    rating_3 INT NOT NULL DEFAULT 0,
+    rating_4 INT NOT NULL DEFAULT 0,
+    rating_5 INT NOT NULL DEFAULT 0,
     owner_id CHAR(36) NOT NULL,
     FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+CREATE INDEX ix_places_geo_cell ON places (geo_cell);
+CREATE INDEX ix_places_price ON places (price);
+CREATE INDEX ix_places_rating_avg ON places (rating_avg);
+CREATE INDEX ix_places_owner_id ON places (owner_id);
+
+-- Full-text index over places (external content; kept in sync by triggers)
+CREATE VIRTUAL TABLE places_fts USING fts5(title, description, content='places', content_rowid='rowid');
+
+CREATE TRIGGER places_fts_insert AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+
+CREATE TRIGGER places_fts_delete AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts (places_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+
+CREATE TRIGGER places_fts_update AFTER UPDATE OF title, description ON places BEGIN
+    INSERT INTO places_fts (places_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO places_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+
 CREATE TABLE reviews (
     id CHAR(36) PRIMARY KEY,
     text TEXT NOT NULL,
     rating INT NOT NULL CHECK (rating >= 1 AND rating <= 5),
     user_id CHAR(36) NOT NULL,
     place_id CHAR(36) NOT NULL,
-    UNIQUE (user_id, place_id),
+    CONSTRAINT uq_reviews_user_id_place_id UNIQUE (user_id, place_id),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE
 );
 
+-- Lookups by user_id use the (user_id, place_id) unique index
+CREATE INDEX ix_reviews_place_id ON reviews (place_id);
+
 CREATE TABLE amenities (
     id CHAR(36) PRIMARY KEY,
     name VARCHAR(255) NOT NULL UNIQUE
@@ -49,3 +87,17 @@ CREATE TABLE place_amenity (
     FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
+
+CREATE INDEX ix_place_amenity_amenity_id ON place_amenity (amenity_id);
+
+-- Write counters per collection, bumped with every write (list ETags)
+CREATE TABLE collection_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0
+);
+
+-- Migrations already applied to this database (flask db-upgrade)
+CREATE TABLE schema_migrations (
+    id VARCHAR(64) PRIMARY KEY,
+    applied_at DATETIME NOT NULL
+);
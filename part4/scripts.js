@@ -1,5 +1,4 @@
 const API_BASE_URL = "http://127.0.0.1:5000/api/v1";
-let allPlaces = [];
 
 document.addEventListener("DOMContentLoaded", () => {
     const loginForm = document.getElementById("login-form");
@@ -75,7 +74,16 @@ function checkAuthentication() {
     return token;
 }
 
-async function fetchPlaces() {
+// Controller of the places request in flight; a newer filter aborts it
+let placesRequest = null;
+
+async function fetchPlaces(maxPrice = "") {
+    if (placesRequest) {
+        placesRequest.abort();
+    }
+    const request = new AbortController();
+    placesRequest = request;
+
     const token = getCookie("token");
     const headers = {};
 
@@ -84,9 +92,12 @@ async function fetchPlaces() {
     }
 
     try {
-        const response = await fetch(`${API_BASE_URL}/places/`, {
+        // Price filtering runs on the server, only matching places are sent
+        const query = maxPrice ? `?max_price=${encodeURIComponent(maxPrice)}` : "";
+        const response = await fetch(`${API_BASE_URL}/places/${query}`, {
             method: "GET",
-            headers
+            headers,
+            signal: request.signal
         });
 
         if (!response.ok) {
@@ -94,9 +105,14 @@ async function fetchPlaces() {
         }
 
         const places = await response.json();
-        allPlaces = places;
-        displayPlaces(allPlaces);
+        // Only the latest request may render, even if an older one finishes later
+        if (request === placesRequest) {
+            displayPlaces(places);
+        }
     } catch (error) {
+        if (request !== placesRequest || error.name === "AbortError") {
+            return;
+        }
         console.error("Fetch places error:", error);
         displayPlaces([]);
         alert("Unable to load places right now.");
@@ -135,16 +151,7 @@ function displayPlaces(places) {
 }
 
 function handlePriceFilter(event) {
-    const selectedValue = event.target.value;
-
-    if (!selectedValue) {
-        displayPlaces(allPlaces);
-        return;
-    }
-
-    const maxPrice = Number(selectedValue);
-    const filteredPlaces = allPlaces.filter((place) => Number(place.price) <= maxPrice);
-    displayPlaces(filteredPlaces);
+    fetchPlaces(event.target.value);
 }
 
 function getPlaceIdFromURL() {